@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from datetime import timedelta
 from pathlib import Path
 from decouple import config
+from corsheaders.defaults import default_headers
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -32,6 +33,8 @@ CORS_ALLOW_ALL_ORIGINS = True
 
 CORS_ALLOW_CREDENTIALS = True
 
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -59,6 +62,12 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# WhiteNoise is sync-only: in the ASGI app it would hand every request, async views
+# included, to a thread. The ASGI app serves static files itself (see app_base/asgi.py).
+SERVE_ASGI = config("SERVE_ASGI", default=False, cast=bool)
+if SERVE_ASGI:
+    MIDDLEWARE.remove('whitenoise.middleware.WhiteNoiseMiddleware')
+
 ROOT_URLCONF = 'app_base.urls'
 
 TEMPLATES = [
@@ -115,6 +124,12 @@ CACHES = {
     }
 }
 
+# Background report jobs (app_core/helpers/report_jobs.py): worker threads and queued jobs per
+# process, and the range (in days) above which the statistical endpoints hand a report to a job.
+REPORT_JOB_WORKERS = config("REPORT_JOB_WORKERS", default=2, cast=int)
+REPORT_JOB_QUEUE_SIZE = config("REPORT_JOB_QUEUE_SIZE", default=20, cast=int)
+REPORT_JOB_MIN_DAYS = config("REPORT_JOB_MIN_DAYS", default=92, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -142,6 +157,11 @@ LANGUAGE_CODE = 'en-us'
 
 TIME_ZONE = 'UTC'
 
+# The restaurant's business day (app_core/helpers/business_day.py): its time zone, as a zone
+# name or a fixed offset such as "+07:00", and the local time at which a new day starts.
+BUSINESS_TIME_ZONE = config("BUSINESS_TIME_ZONE", default=TIME_ZONE)
+BUSINESS_DAY_CUTOFF = config("BUSINESS_DAY_CUTOFF", default="00:00")
+
 USE_I18N = True
 
 USE_TZ = True
@@ -163,6 +183,9 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'app_core.User'
 
+# Partial ("live row") indexes are created without their condition on MySQL, which is intended
+SILENCED_SYSTEM_CHECKS = ["models.W037"]
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=180),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=30),
@@ -2,4 +2,22 @@ class UnVerifiedException(Exception):
     pass
 
 class InvalidFileContentException(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class InvalidCursorException(Exception):
+    pass
+
+class InvalidPriceFilterException(Exception):
+    pass
+
+class InvalidDateFilterException(Exception):
+    pass
+
+class OutOfStockException(Exception):
+    def __init__(self, item_type, item_id):
+        super().__init__(f"{item_type} {item_id} is out of stock")
+        self.item_type = item_type
+        self.item_id = item_id
+
+class ReportJobQueueFullException(Exception):
+    pass
@@ -0,0 +1,19 @@
+import asyncio
+import weakref
+from django.conf import settings
+from redis import asyncio as aioredis
+
+_clients = weakref.WeakKeyDictionary()
+
+def get_async_connection() -> aioredis.Redis:
+    """asyncio Redis client for the running event loop, created on first use.
+
+    A client is bound to the loop it was created on, so each loop (one per
+    uvicorn worker) gets its own connection pool.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = aioredis.Redis.from_url(settings.REDIS_CONN_STR)
+        _clients[loop] = client
+    return client
\ No newline at end of file
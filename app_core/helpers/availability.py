@@ -0,0 +1,93 @@
+from datetime import date
+from django.db.models import Sum
+
+from app_core.models.order import OrderStatus
+from app_core.models.order_item import OrderItem, OrderItemType
+from app_core.models.daily_quantity import DailyQuantity
+from app_core.helpers.business_day import business_day, window_filter
+from app_core.helpers.menu_snapshot import get_menu_version
+from app_core.helpers.stock_version import get_stock_version
+
+class DailyAvailability:
+    """Sold and remaining quantities of every dish and combo for one day.
+
+    Items with a plan for the day read both figures from their
+    ``DailyQuantity`` row, whose ``sold`` counter is kept up to date by the
+    order endpoints. Sold figures of unplanned items come from one grouped
+    query over the day's order items, run only if such an item is asked for.
+    A serializer tree shares one instance through its context.
+    """
+
+    def __init__(self, day: date = None):
+        self.day = day or business_day()
+        self.__plans = None
+        self.__sold = None
+
+    def __plan_rows(self):
+        return DailyQuantity.objects.filter(date=self.day).values('dish_id', 'combo_id', 'quantity', 'sold')
+
+    def __sold_rows(self):
+        return (
+            OrderItem.objects.filter(
+                deleted_at=None,
+                **window_filter("order__created_at", self.day),
+                order__status__in=[OrderStatus.PENDING, OrderStatus.COMPLETED]
+            )
+            .values('type', 'dish_id', 'combo_id')
+            .annotate(total=Sum('quantity'))
+        )
+
+    def __set_plans(self, rows):
+        self.__plans = {}
+        for r in rows:
+            key = (OrderItemType.DISH, r['dish_id']) if r['dish_id'] else (OrderItemType.COMBO, r['combo_id'])
+            self.__plans.setdefault(key, r)
+
+    def __set_sold(self, rows):
+        self.__sold = {}
+        for r in rows:
+            key = (r['type'], r['dish_id'] if r['type'] == OrderItemType.DISH else r['combo_id'])
+            self.__sold[key] = self.__sold.get(key, 0) + r['total']
+
+    def __load_plans(self):
+        self.__set_plans(self.__plan_rows())
+
+    def __load_sold(self):
+        self.__set_sold(self.__sold_rows())
+
+    async def aload(self, keys):
+        """Read up front, with the async ORM, everything needed for the ``(type, id)`` keys,
+        so async views can serialize without blocking queries."""
+        self.__set_plans([r async for r in self.__plan_rows()])
+        if any(key not in self.__plans for key in keys):
+            self.__set_sold([r async for r in self.__sold_rows()])
+        return self
+
+    def __plan(self, item_type: str, item_id: int):
+        if self.__plans is None:
+            self.__load_plans()
+        return self.__plans.get((item_type, item_id))
+
+    def sold_quantity(self, item_type: str, item_id: int) -> int:
+        plan = self.__plan(item_type, item_id)
+        if plan is not None:
+            return plan['sold']
+
+        if self.__sold is None:
+            self.__load_sold()
+        return self.__sold.get((item_type, item_id), 0)
+
+    def remaining_quantity(self, item_type: str, item_id: int):
+        plan = self.__plan(item_type, item_id)
+        if plan is None:
+            return None  # Chưa set số lượng cho hôm nay
+
+        return max(0, plan['quantity'] - plan['sold'])
+
+def get_availability(context: dict) -> DailyAvailability:
+    """Return the provider shared by a serializer tree, creating it on first use."""
+    return context.setdefault("availability", DailyAvailability())
+
+def get_menu_availability_version() -> str:
+    """Cache version of menu responses that carry today's figures: moves with the menu and with the stock."""
+    return f"{get_menu_version()}:{get_stock_version()}"
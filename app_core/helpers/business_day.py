@@ -0,0 +1,68 @@
+"""
+The restaurant's business day.
+
+A business day is a calendar day in ``BUSINESS_TIME_ZONE`` that starts at
+``BUSINESS_DAY_CUTOFF`` rather than midnight: with a 04:00 cutoff, an order
+taken at 01:30 belongs to the previous evening's service.
+
+Filters compare the raw datetime column with half-open ``[start, end)``
+bounds (``window_filter``), so its index stays usable; wrapping the column in
+``__date`` would not. Reports that group per day do it in SQL with
+``business_day_of``.
+"""
+import re
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+from django.conf import settings
+from django.db.models import DateTimeField, ExpressionWrapper, F, Value
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from app_core.errors.exceptions import InvalidDateFilterException
+
+_OFFSET = re.compile(r"^([+-])(\d{2}):(\d{2})$")
+
+def get_business_time_zone():
+    """``BUSINESS_TIME_ZONE`` as a tzinfo. A fixed offset such as "+07:00" works on MySQL
+    without its time zone tables; a zone name needs them loaded."""
+    name = settings.BUSINESS_TIME_ZONE
+    offset = _OFFSET.match(name)
+    if offset is None:
+        return ZoneInfo(name)
+
+    sign, hours, minutes = offset.groups()
+    delta = timedelta(hours=int(hours), minutes=int(minutes))
+    return dt_timezone(-delta if sign == "-" else delta)
+
+def get_cutoff() -> timedelta:
+    hours, minutes = settings.BUSINESS_DAY_CUTOFF.split(":")
+    return timedelta(hours=int(hours), minutes=int(minutes))
+
+def business_day(value: datetime = None) -> date:
+    """The business day ``value`` (an aware datetime, now by default) belongs to."""
+    local = timezone.localtime(value or timezone.now(), get_business_time_zone())
+    return (local - get_cutoff()).date()
+
+def day_start(day: date) -> datetime:
+    return datetime.combine(day, time(), tzinfo=get_business_time_zone()) + get_cutoff()
+
+def parse_filter_date(value: str) -> date:
+    """A yyyy-mm-dd query param as a date; raises ``InvalidDateFilterException`` otherwise."""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise InvalidDateFilterException(value)
+
+def window_filter(field: str, first: date, last: date = None) -> dict:
+    """Lookups selecting rows whose ``field`` falls in business days ``first``..``last`` (inclusive)."""
+    return {
+        f"{field}__gte": day_start(first),
+        f"{field}__lt": day_start((last or first) + timedelta(days=1)),
+    }
+
+def business_day_of(field: str):
+    """SQL expression of the business day of the datetime column ``field``, for grouping."""
+    expression = F(field)
+    if get_cutoff():
+        expression = ExpressionWrapper(expression - Value(get_cutoff()), output_field=DateTimeField())
+    return TruncDate(expression, tzinfo=get_business_time_zone())
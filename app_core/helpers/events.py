@@ -0,0 +1,149 @@
+"""
+Order events for the live SSE stream.
+
+Writers call ``publish_order_event``; after the transaction commits the event
+is appended to the Redis stream ``events:orders`` (its entry id is the SSE
+event id, so clients can resume with ``Last-Event-ID``) and a wake-up is
+published on ``events:orders:live``. Each worker process holds one pub/sub
+subscription (``order_event_hub``) that reads the new entries once and fans
+them out to every client connected to that process.
+"""
+import asyncio
+import json
+import logging
+from django.db import transaction
+from django_redis import get_redis_connection
+
+from app_core.helpers.async_redis import get_async_connection
+
+ORDER_EVENT_STREAM = "events:orders"
+ORDER_EVENT_CHANNEL = "events:orders:live"
+STREAM_MAXLEN = 10000
+CLIENT_QUEUE_SIZE = 1000
+READ_BATCH_SIZE = 1000
+
+class OrderEvent:
+    ORDER_CREATED = "order.created"
+    ORDER_CANCELLED = "order.cancelled"
+    ORDER_ITEMS_CHANGED = "order.items_changed"
+    ITEM_ADDED = "item.added"
+    ITEM_UPDATED = "item.updated"
+    ITEM_REMOVED = "item.removed"
+    BILL_CREATED = "bill.created"
+
+def item_event_data(item) -> dict:
+    return {
+        "id": item.id,
+        "order": item.order_id,
+        "type": item.type,
+        "dish": item.dish_id,
+        "combo": item.combo_id,
+        "quantity": item.quantity,
+        "note": item.note,
+    }
+
+def publish_order_event(event_type: str, data: dict):
+    """Publish ``event_type`` once the current transaction commits (immediately outside one)."""
+    transaction.on_commit(lambda: _publish(event_type, data))
+
+def _publish(event_type: str, data: dict):
+    # Events are best effort: a Redis hiccup must not fail a write that is already committed.
+    try:
+        conn = get_redis_connection("default")
+        conn.xadd(ORDER_EVENT_STREAM, {"type": event_type, "data": json.dumps(data, default=str)}, maxlen=STREAM_MAXLEN, approximate=True)
+        conn.publish(ORDER_EVENT_CHANNEL, event_type)
+    except Exception as e:
+        logging.getLogger().exception("events._publish exc=%s, type=%s", e, event_type)
+
+def parse_event_id(event_id: str):
+    """Stream ids are "<ms>-<seq>"; compare them as tuples."""
+    ms, _, seq = event_id.partition("-")
+    return int(ms), int(seq or 0)
+
+def decode_entry(entry) -> dict:
+    entry_id, fields = entry
+    return {
+        "id": entry_id.decode(),
+        "type": fields[b"type"].decode(),
+        "data": fields[b"data"].decode(),
+    }
+
+async def read_events_after(event_id: str, count: int = READ_BATCH_SIZE) -> list:
+    """Entries of the stream strictly after ``event_id``, oldest first."""
+    entries = await get_async_connection().xrange(ORDER_EVENT_STREAM, min=event_id, max="+", count=count + 1)
+    return [event for event in map(decode_entry, entries) if event["id"] != event_id][:count]
+
+class _OrderEventHub:
+    """One pub/sub subscription per process, fanned out to per-client queues.
+
+    A client whose queue fills up is sent ``None`` and dropped; it reconnects
+    and catches up from its ``Last-Event-ID``. A run stops once its last client
+    is gone, or on an error (its clients are then sent ``None``); the next
+    ``subscribe`` starts a new run.
+    """
+
+    def __init__(self):
+        self.__queues = set()
+        self.__task = None
+        self.__ready = None
+
+    async def subscribe(self) -> asyncio.Queue:
+        """Register a client queue. Returns once the hub is listening, so every event
+        published from then on reaches the queue."""
+        queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self.__queues.add(queue)
+        if self.__task is None or self.__task.done():
+            self.__ready = asyncio.Event()
+            self.__task = asyncio.get_running_loop().create_task(self.__run(self.__ready))
+        await self.__ready.wait()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.__queues.discard(queue)
+
+    async def __run(self, ready: asyncio.Event):
+        try:
+            conn = get_async_connection()
+            pubsub = conn.pubsub()
+            await pubsub.subscribe(ORDER_EVENT_CHANNEL)
+
+            latest = await conn.xrevrange(ORDER_EVENT_STREAM, count=1)
+            last_id = latest[0][0].decode() if latest else "0-0"
+            ready.set()
+
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+
+                while True:
+                    events = await read_events_after(last_id)
+                    for event in events:
+                        last_id = event["id"]
+                        self.__dispatch(event)
+                    if len(events) < READ_BATCH_SIZE:
+                        break
+
+                if not self.__queues:
+                    # Detached before the next await, so a client subscribing from now on starts a new run
+                    self.__task = None
+                    break
+            await pubsub.aclose()
+        except Exception as e:
+            logging.getLogger().exception("_OrderEventHub.run exc=%s", e)
+        finally:
+            ready.set()
+            # Still attached: the run failed, and every registered client belongs to it
+            if self.__task is asyncio.current_task():
+                self.__task = None
+                self.__dispatch(None)
+
+    def __dispatch(self, event):
+        for queue in list(self.__queues):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.__queues.discard(queue)
+                queue.get_nowait()
+                queue.put_nowait(None)
+
+order_event_hub = _OrderEventHub()
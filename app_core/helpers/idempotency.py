@@ -0,0 +1,97 @@
+"""
+``Idempotency-Key`` support for write endpoints.
+
+The first request with a given key runs the view and its response is kept in
+the cache for ``IDEMPOTENCY_TTL`` seconds. Retries with the same key get that
+response back (with an ``Idempotent-Replayed`` header) without running the
+view again. A retry that arrives while the first request is still running
+waits up to ``WAIT_TIMEOUT`` for its response, a bound kept short since it
+holds the request's thread (under ASGI, where sync views share one thread,
+it does not wait). If the first request is not done by then, the retry gets
+a 409 with a ``Retry-After`` header. Keys are scoped per user and per
+endpoint, and a key reused with a different body is rejected.
+"""
+import functools
+import hashlib
+import json
+import time
+from django.conf import settings
+from django.core.cache import cache
+from drf_yasg import openapi
+from rest_framework import status
+from rest_framework.response import Response
+
+from app_core.helpers.redis_lock import acquire_lock, release_lock
+from app_core.helpers.response import RestResponse
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_TTL = 24 * 60 * 60
+LOCK_TIMEOUT = 30
+WAIT_TIMEOUT = 2
+WAIT_INTERVAL = 0.05
+RETRY_AFTER = 1
+
+IDEMPOTENCY_KEY_PARAMETER = openapi.Parameter(
+    name=IDEMPOTENCY_HEADER, in_=openapi.IN_HEADER, type=openapi.TYPE_STRING, required=False,
+    description="Client-generated key; retries with the same key replay the first response"
+)
+
+def _fingerprint(request) -> str:
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+def idempotent(view_method):
+    """Decorate a ViewSet action so it honours the ``Idempotency-Key`` request header."""
+
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+
+        base_key = f"idempotency:{request.user.id}:{request.method}:{request.path}:{key}"
+        response_key = f"{base_key}:response"
+        lock_key = f"{base_key}:lock"
+        fingerprint = _fingerprint(request)
+
+        token = acquire_lock(lock_key, LOCK_TIMEOUT)
+        deadline = time.monotonic() + (0 if settings.SERVE_ASGI else WAIT_TIMEOUT)
+        while token is None:
+            stored = cache.get(response_key)
+            if stored is not None:
+                return _replay(stored, fingerprint)
+            if time.monotonic() >= deadline:
+                response = RestResponse(status=status.HTTP_409_CONFLICT, message="Yêu cầu đang được xử lý, vui lòng thử lại sau!").response
+                response["Retry-After"] = str(RETRY_AFTER)
+                return response
+            time.sleep(WAIT_INTERVAL)
+            # Taken over if the first request ended without storing a response (a server error)
+            token = acquire_lock(lock_key, LOCK_TIMEOUT)
+
+        try:
+            stored = cache.get(response_key)
+            if stored is not None:
+                return _replay(stored, fingerprint)
+
+            response = view_method(self, request, *args, **kwargs)
+
+            # Server errors are not stored, so the client can retry them with the same key
+            if response.status_code < 500:
+                cache.set(response_key, {
+                    "fingerprint": fingerprint,
+                    "status": response.status_code,
+                    "data": response.data,
+                }, timeout=IDEMPOTENCY_TTL)
+            return response
+        finally:
+            release_lock(lock_key, token)
+
+    return wrapper
+
+def _replay(stored: dict, fingerprint: str) -> Response:
+    if stored["fingerprint"] != fingerprint:
+        return RestResponse(status=status.HTTP_422_UNPROCESSABLE_ENTITY, message="Idempotency-Key đã được dùng cho một yêu cầu khác!").response
+
+    response = Response(stored["data"], status=stored["status"], content_type=RestResponse.content_type)
+    response["Idempotent-Replayed"] = "true"
+    return response
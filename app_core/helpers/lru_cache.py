@@ -0,0 +1,43 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+class TTLLRUCache:
+    """Small thread-safe in-process LRU whose entries also expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.__data = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self.__lock:
+            entry = self.__data.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self.__data[key]
+                return default
+
+            self.__data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self.__lock:
+            self.__data[key] = (time.monotonic() + self.ttl, value)
+            self.__data.move_to_end(key)
+            while len(self.__data) > self.maxsize:
+                self.__data.popitem(last=False)
+
+    def delete_where(self, predicate: Callable[[Any], bool]):
+        with self.__lock:
+            for key in [k for k, (_, v) in self.__data.items() if predicate(v)]:
+                del self.__data[key]
+
+    def clear(self):
+        with self.__lock:
+            self.__data.clear()
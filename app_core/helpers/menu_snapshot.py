@@ -0,0 +1,197 @@
+"""
+Read-only, in-process snapshot of the menu (dishes, combos, dining tables).
+
+Every worker keeps its own copy and rebuilds it when the version counter
+``menu:version`` in Redis moves. Writers call ``bump_menu_version`` after
+committing, which increments the counter and publishes the new version on
+``menu:invalidate``; a listener thread per worker picks it up immediately.
+If the listener is down, readers fall back to polling the counter at most
+once per ``POLL_INTERVAL`` seconds.
+"""
+import logging
+import threading
+import time
+from asgiref.sync import sync_to_async
+from django_redis import get_redis_connection
+
+from app_core.models.dish import Dish, DishStatus
+from app_core.models.combo import Combo
+from app_core.models.dining_table import DiningTable
+
+MENU_VERSION_KEY = "menu:version"
+MENU_CHANNEL = "menu:invalidate"
+POLL_INTERVAL = 1.0
+
+class DishRecord:
+    __slots__ = ("id", "name", "price", "status", "type", "data")
+
+    def __init__(self, dish: Dish, data: dict):
+        self.id = dish.id
+        self.name = dish.name
+        self.price = dish.price
+        self.status = dish.status
+        self.type = dish.type
+        self.data = data
+
+    def as_instance(self) -> Dish:
+        """A Dish usable as a foreign key value or for its price, without a query."""
+        dish = Dish(id=self.id, name=self.name, price=self.price, status=self.status, type=self.type)
+        dish._state.adding = False
+        dish._state.db = "default"
+        return dish
+
+class ComboRecord:
+    __slots__ = ("id", "name", "price", "discount", "dishes", "data")
+
+    def __init__(self, combo: Combo, data: dict):
+        self.id = combo.id
+        self.name = combo.name
+        self.price = combo.annotated_price
+        self.discount = combo.discount
+        self.dishes = tuple((combo_dish.dish_id, combo_dish.quantity) for combo_dish in combo.live_combo_dishes)
+        self.data = data
+
+    def as_instance(self) -> Combo:
+        """A Combo usable as a foreign key value or for its price, without a query."""
+        combo = Combo(id=self.id, name=self.name, discount=self.discount)
+        combo.annotated_price = self.price
+        combo._state.adding = False
+        combo._state.db = "default"
+        return combo
+
+class DiningTableRecord:
+    __slots__ = ("id", "code", "number_of_seats", "data")
+
+    def __init__(self, table: DiningTable, data: dict):
+        self.id = table.id
+        self.code = table.code
+        self.number_of_seats = table.number_of_seats
+        self.data = data
+
+class MenuSnapshot:
+    __slots__ = ("version", "dishes", "combos", "dining_tables")
+
+    def __init__(self, version, dishes: dict, combos: dict, dining_tables: dict):
+        self.version = version
+        self.dishes = dishes
+        self.combos = combos
+        self.dining_tables = dining_tables
+
+    def get_selling_dish(self, pk):
+        record = self.dishes.get(pk)
+        return record if record is not None and record.status == DishStatus.SELLING else None
+
+class _StaticAvailability:
+    """Placeholder so the snapshot stores serializer output without today's figures."""
+
+    def sold_quantity(self, item_type, item_id):
+        return 0
+
+    def remaining_quantity(self, item_type, item_id):
+        return None
+
+_lock = threading.Lock()
+_snapshot = None
+_published_version = None
+_last_polled = 0.0
+_listener = None
+
+def _connection():
+    return get_redis_connection("default")
+
+def _read_version():
+    version = _connection().get(MENU_VERSION_KEY)
+    return int(version) if version is not None else 0
+
+def _listen():
+    global _published_version
+    while True:
+        try:
+            pubsub = _connection().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(MENU_CHANNEL)
+            _published_version = _read_version()
+            for message in pubsub.listen():
+                _published_version = int(message["data"])
+        except Exception as e:
+            logging.getLogger().exception("menu_snapshot._listen exc=%s", e)
+            _published_version = None
+            time.sleep(POLL_INTERVAL)
+
+def _ensure_listener():
+    global _listener
+    if _listener is not None and _listener.is_alive():
+        return
+    with _lock:
+        if _listener is None or not _listener.is_alive():
+            _listener = threading.Thread(target=_listen, name="menu-snapshot-listener", daemon=True)
+            _listener.start()
+
+def _current_version():
+    global _published_version, _last_polled
+    if _published_version is not None:
+        return _published_version
+
+    now = time.monotonic()
+    if _snapshot is None or now - _last_polled >= POLL_INTERVAL:
+        _last_polled = now
+        return _read_version()
+    return _snapshot.version
+
+def _build(version) -> MenuSnapshot:
+    from app_core.serializers.dish import DishSerializer
+    from app_core.serializers.combo import ComboSerializer
+    from app_core.serializers.dining_table import DiningTableSerializer
+
+    context = {"availability": _StaticAvailability()}
+
+    dishes = list(Dish.objects.filter(deleted_at=None).order_by("id"))
+    combos = list(Combo.objects.filter(deleted_at=None).with_price().with_live_dishes().order_by("id"))
+    tables = list(DiningTable.objects.filter(deleted_at=None).order_by("id"))
+
+    return MenuSnapshot(
+        version=version,
+        dishes={
+            dish.id: DishRecord(dish, data)
+            for dish, data in zip(dishes, DishSerializer(dishes, many=True, context=context).data)
+        },
+        combos={
+            combo.id: ComboRecord(combo, data)
+            for combo, data in zip(combos, ComboSerializer(combos, many=True, context=context).data)
+        },
+        dining_tables={
+            table.id: DiningTableRecord(table, data)
+            for table, data in zip(tables, DiningTableSerializer(tables, many=True).data)
+        },
+    )
+
+def get_menu_version() -> int:
+    """The current menu version, without rebuilding the snapshot."""
+    _ensure_listener()
+    return _current_version()
+
+def get_menu_snapshot() -> MenuSnapshot:
+    """Return this worker's snapshot, rebuilding it first if the menu version moved."""
+    global _snapshot
+    _ensure_listener()
+    version = _current_version()
+
+    if _snapshot is None or _snapshot.version != version:
+        with _lock:
+            if _snapshot is None or _snapshot.version != version:
+                _snapshot = _build(version)
+
+    return _snapshot
+
+async def aget_menu_snapshot() -> MenuSnapshot:
+    """``get_menu_snapshot`` for async views. Returns straight from memory while the listener
+    reports the current version; a version poll or rebuild runs in a worker thread."""
+    snapshot = _snapshot
+    if snapshot is not None and _published_version is not None and snapshot.version == _published_version:
+        return snapshot
+    return await sync_to_async(get_menu_snapshot)()
+
+def bump_menu_version():
+    """Call after a menu write has been saved, so every worker reloads its snapshot."""
+    conn = _connection()
+    version = conn.incr(MENU_VERSION_KEY)
+    conn.publish(MENU_CHANNEL, version)
@@ -1,17 +1,16 @@
 import logging
 import random
 from enum import Enum
-from django.core.cache import cache
+
+from app_core.helpers import session_store
 
 class OTPPurpose(Enum):
     Session = "session"
 
 def generate_otp(length: int, purpose: OTPPurpose, email: str) -> str:
     try:
-        cache.delete_many(cache.keys(f"{purpose}:account:{email}:otp:*"))
-
         otp = str(random.randint(10**length, 10**(length + 1) - 1))
-        cache.set(f"{purpose}:account:{email}:otp:{otp}", email, 3600)
+        session_store.save_otp(purpose, email, otp, 3600)
 
         return otp
     except Exception as e:
@@ -19,4 +18,4 @@ def generate_otp(length: int, purpose: OTPPurpose, email: str) -> str:
 
 def verify_otp(purpose: OTPPurpose, email: str, otp: str) -> bool:
     return True
-    return cache.get(f"{purpose}:account:{email}:otp:{otp}", None) is not None
\ No newline at end of file
+    return session_store.get_otp(purpose, email) == otp
\ No newline at end of file
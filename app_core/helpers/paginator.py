@@ -1,5 +1,12 @@
+import base64
+from datetime import datetime
+from django.core.paginator import InvalidPage, Page
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 
+from app_core.errors.exceptions import InvalidCursorException
+
 class CustomPageNumberPagination(PageNumberPagination):
     page_size_query_param = "size"
     max_page_size = 50
@@ -10,4 +17,115 @@ class CustomPageNumberPagination(PageNumberPagination):
             'total_page': self.page.paginator.num_pages,
             'current_page': self.page.number,
             'results': data
-        }
\ No newline at end of file
+        }
+
+    async def apaginate_queryset(self, queryset, request):
+        """``paginate_queryset`` for async views: counts and reads the page with the async ORM."""
+        page_size = self.get_page_size(request)
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+
+        try:
+            number = paginator.validate_number(self.get_page_number(request, paginator))
+        except InvalidPage as e:
+            raise NotFound(self.invalid_page_message.format(page_number=request.query_params.get(self.page_query_param), message=str(e)))
+
+        bottom = (number - 1) * page_size
+        rows = [row async for row in queryset[bottom:bottom + page_size]]
+        self.page = Page(rows, number, paginator)
+        self.request = request
+        return list(self.page)
+
+class KeysetCursorPagination(CustomPageNumberPagination):
+    """Keyset pagination on (created_at, id), newest first.
+
+    The cursor is an opaque token holding the (created_at, id) of the last row
+    of the previous page, so every page is a single index range read no matter
+    how deep the client scrolls.
+    """
+    cursor_query_param = "cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.__set_page(list(self.__page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request):
+        return self.__set_page([row async for row in self.__page_queryset(queryset, request)])
+
+    def __page_queryset(self, queryset, request):
+        self.page_size = self.get_page_size(request)
+        cursor = request.query_params.get(self.cursor_query_param, "")
+
+        queryset = queryset.order_by("-created_at", "-id")
+        if cursor:
+            created_at, pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+        return queryset[:self.page_size + 1]
+
+    def __set_page(self, rows):
+        self.has_next = len(rows) > self.page_size
+        self.page_rows = rows[:self.page_size]
+        return self.page_rows
+
+    def get_paginated_data(self, data):
+        next_cursor = None
+        if self.has_next:
+            last = self.page_rows[-1]
+            next_cursor = self.encode_cursor(last.created_at, last.id)
+
+        return {
+            'next_cursor': next_cursor,
+            'results': data
+        }
+
+    @staticmethod
+    def encode_cursor(created_at, pk):
+        raw = f"{created_at.isoformat()}|{pk}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            created_at, pk = raw.rsplit("|", 1)
+            return datetime.fromisoformat(created_at), int(pk)
+        except (ValueError, UnicodeError) as e:
+            raise InvalidCursorException(str(e))
+
+def paginate_and_serialize(request, queryset, serializer_class, context=None, allow_cursor=False):
+    """Paginate ``queryset`` first and serialize only the rows of the current page.
+
+    Page number mode (``?page=&size=``) is the default. When ``allow_cursor`` is
+    set and the client sends ``?cursor=`` (empty for the first page), keyset
+    pagination is used instead. ``context`` may be a dict or a callable taking
+    the page rows, for serializers that preload data for the page.
+    """
+    if allow_cursor and KeysetCursorPagination.cursor_query_param in request.query_params:
+        paginator = KeysetCursorPagination()
+    else:
+        paginator = CustomPageNumberPagination()
+        if hasattr(queryset, "ordered") and not queryset.ordered:
+            queryset = queryset.order_by("pk")
+
+    page = paginator.paginate_queryset(queryset, request)
+
+    if callable(context):
+        context = context(page)
+
+    serializer = serializer_class(page, many=True, context=context or {})
+    return paginator.get_paginated_data(serializer.data)
+
+async def apaginate_and_serialize(request, queryset, serializer_class, context=None, allow_cursor=False):
+    """``paginate_and_serialize`` for async views. The page (with its ``prefetch_related``)
+    is read through the async ORM, so the serializer must not need further queries."""
+    if allow_cursor and KeysetCursorPagination.cursor_query_param in request.query_params:
+        paginator = KeysetCursorPagination()
+    else:
+        paginator = CustomPageNumberPagination()
+        if not queryset.ordered:
+            queryset = queryset.order_by("pk")
+
+    page = await paginator.apaginate_queryset(queryset, request)
+
+    serializer = serializer_class(page, many=True, context=context or {})
+    return paginator.get_paginated_data(serializer.data)
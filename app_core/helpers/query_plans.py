@@ -0,0 +1,73 @@
+"""
+EXPLAIN checks for the hot query shapes.
+
+``check_hot_queries`` EXPLAINs each query of ``hot_queries`` and tells whether
+it is served by an index or reads its whole table. It is shared by the
+``check_query_plans`` command and the tests. SQLite's text plan, MySQL's JSON
+plan and PostgreSQL's JSON plan are understood; on PostgreSQL sequential scans
+are disabled for the check, so it asks whether an index can serve the query
+rather than which plan the data makes cheapest.
+"""
+import json
+from django.db import connection, transaction
+
+from app_core.models.bill import Bill
+from app_core.models.order import Order, OrderStatus
+from app_core.models.order_item import OrderItem
+from app_core.models.daily_quantity import DailyQuantity
+from app_core.helpers.business_day import business_day, window_filter
+
+SUPPORTED_VENDORS = ("mysql", "postgresql", "sqlite")
+
+def hot_queries():
+    """``(label, queryset)`` for each query shape the indexes of migration 0002 are for."""
+    today = business_day()
+    return [
+        ("pending order of a table", Order.objects.filter(dining_table_id=1, status=OrderStatus.PENDING)),
+        ("orders by status and table", Order.objects.filter(status=OrderStatus.COMPLETED, dining_table_id=1).order_by("-created_at")),
+        ("pending orders by subtotal", Order.objects.filter(status=OrderStatus.PENDING).order_by("subtotal")),
+        ("bills of a day", Bill.objects.filter(**window_filter("created_at", today))),
+        ("live items of an order", OrderItem.objects.filter(order_id=1, deleted_at=None)),
+        ("daily quantity of a dish", DailyQuantity.objects.filter(date=today, dish_id=1)),
+        ("daily quantity of a combo", DailyQuantity.objects.filter(date=today, combo_id=1)),
+    ]
+
+def explain(queryset):
+    if connection.vendor == "sqlite":
+        return queryset.explain()
+    return json.loads(queryset.explain(format="json"))
+
+def uses_index(plan, table: str) -> bool:
+    if connection.vendor == "sqlite":
+        # "SEARCH t USING INDEX i (...)" is an index lookup, a bare "SCAN t" reads the table
+        return not any(
+            f"SCAN {table}" in line and "INDEX" not in line
+            for line in plan.splitlines()
+        )
+    return not any(_full_scans(plan, table))
+
+def _full_scans(node, table):
+    if isinstance(node, list):
+        for child in node:
+            yield from _full_scans(child, table)
+    elif isinstance(node, dict):
+        # PostgreSQL: {"Node Type": "Seq Scan", "Relation Name": t}; MySQL: {"table_name": t, "access_type": "ALL"}
+        if node.get("Relation Name") == table and node.get("Node Type") == "Seq Scan":
+            yield node
+        if node.get("table_name") == table and node.get("access_type") == "ALL":
+            yield node
+        for child in node.values():
+            yield from _full_scans(child, table)
+
+def check_hot_queries():
+    """``[(label, plan, uses_index)]`` for every hot query, in ``hot_queries`` order."""
+    results = []
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+
+        for label, queryset in hot_queries():
+            plan = explain(queryset)
+            results.append((label, plan, uses_index(plan, queryset.model._meta.db_table)))
+    return results
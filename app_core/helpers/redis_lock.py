@@ -0,0 +1,29 @@
+"""
+Short-lived per-key locks in Redis.
+
+``acquire_lock`` takes the lock with ``SET NX EX`` and returns the random
+token that owns it. ``release_lock`` deletes the key only while it still
+holds that token, checked and deleted in one Lua script: a holder whose lock
+expired must not delete the lock another request took in the meantime.
+"""
+import uuid
+from typing import Optional
+from django_redis import get_redis_connection
+
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+def acquire_lock(key: str, timeout: int) -> Optional[str]:
+    """Return the token of the lock on ``key``, or None if someone else holds it."""
+    token = uuid.uuid4().hex
+    if get_redis_connection("default").set(key, token, nx=True, ex=timeout):
+        return token
+    return None
+
+def release_lock(key: str, token: str) -> bool:
+    """Release the lock on ``key`` if ``token`` still owns it."""
+    return bool(get_redis_connection("default").eval(_RELEASE_SCRIPT, 1, key, token))
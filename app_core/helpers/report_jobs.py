@@ -0,0 +1,130 @@
+"""
+Background jobs for reports too long to compute inside a request.
+
+``submit_report_job`` queues a report on this process's bounded thread pool
+and returns its job record right away. The record, and the result once the
+job succeeds, are kept in the cache (Redis) for ``REPORT_JOB_TTL`` seconds,
+so any worker can answer a poll. Submitting a report with the same params as
+a job that is still queued or running returns that job instead of starting
+another. A job that never finishes (its worker was restarted, say) reads as
+failed after ``REPORT_JOB_TIMEOUT`` seconds.
+"""
+import hashlib
+import json
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Callable, Optional
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connections
+from django.utils import timezone
+
+from app_core.errors.exceptions import ReportJobQueueFullException
+
+REPORT_JOB_TTL = 24 * 60 * 60
+REPORT_JOB_TIMEOUT = 30 * 60
+
+class ReportJobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+_pool = None
+_slots = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    # Created on first use, so that each gunicorn worker gets its own after the fork
+    global _pool, _slots
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=settings.REPORT_JOB_WORKERS, thread_name_prefix="report-job")
+            _slots = threading.BoundedSemaphore(settings.REPORT_JOB_WORKERS + settings.REPORT_JOB_QUEUE_SIZE)
+    return _pool, _slots
+
+def _job_key(job_id: str) -> str:
+    return f"report_job:{job_id}"
+
+def _result_key(job_id: str) -> str:
+    return f"report_job:{job_id}:result"
+
+def _active_key(report: str, params: dict) -> str:
+    fingerprint = hashlib.sha256(json.dumps([report, params], sort_keys=True, default=str).encode()).hexdigest()
+    return f"report_job:active:{fingerprint}"
+
+def _save(job: dict):
+    cache.set(_job_key(job["id"]), job, timeout=REPORT_JOB_TTL)
+
+def submit_report_job(report: str, params: dict, compute: Callable[[], Any]) -> dict:
+    """Queue ``compute()`` as the job for ``report`` with ``params`` and return the job record.
+
+    Raises ``ReportJobQueueFullException`` when this process already has as many
+    jobs as it will hold.
+    """
+    pool, slots = _get_pool()
+    if not slots.acquire(blocking=False):
+        raise ReportJobQueueFullException()
+
+    submitted = False
+    try:
+        job = {
+            "id": uuid.uuid4().hex,
+            "report": report,
+            "params": params,
+            "status": ReportJobStatus.QUEUED,
+            "error": None,
+            "created_at": timezone.now(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        _save(job)
+
+        active_key = _active_key(report, params)
+        while not cache.add(active_key, job["id"], timeout=REPORT_JOB_TIMEOUT):
+            running = get_report_job(cache.get(active_key) or "")
+            if running is not None and running["status"] in (ReportJobStatus.QUEUED, ReportJobStatus.RUNNING):
+                cache.delete(_job_key(job["id"]))
+                return running
+            cache.delete(active_key)
+
+        # _run updates its copy of the record from the pool thread
+        pool.submit(_run, dict(job), active_key, compute).add_done_callback(lambda _: slots.release())
+        submitted = True
+        return job
+    finally:
+        if not submitted:
+            slots.release()
+
+def _run(job: dict, active_key: str, compute: Callable[[], Any]):
+    close_old_connections()
+    try:
+        job.update(status=ReportJobStatus.RUNNING, started_at=timezone.now())
+        _save(job)
+        cache.set(_result_key(job["id"]), compute(), timeout=REPORT_JOB_TTL)
+        job.update(status=ReportJobStatus.SUCCEEDED, finished_at=timezone.now())
+    except Exception as e:
+        logging.getLogger().exception("report_jobs._run exc=%s, job=%s", e, job["id"])
+        job.update(status=ReportJobStatus.FAILED, error=str(e), finished_at=timezone.now())
+    finally:
+        _save(job)
+        if cache.get(active_key) == job["id"]:
+            cache.delete(active_key)
+        # The pool thread outlives the job; don't leave its connections open in between
+        connections.close_all()
+
+def get_report_job(job_id: str) -> Optional[dict]:
+    job = cache.get(_job_key(job_id))
+    if (
+        job is not None
+        and job["status"] in (ReportJobStatus.QUEUED, ReportJobStatus.RUNNING)
+        and timezone.now() - job["created_at"] > timedelta(seconds=REPORT_JOB_TIMEOUT)
+    ):
+        job = {**job, "status": ReportJobStatus.FAILED, "error": "The job did not finish in time"}
+    return job
+
+def get_report_result(job_id: str) -> Any:
+    return cache.get(_result_key(job_id))
@@ -1,4 +1,6 @@
+from django.http import JsonResponse
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 
 class RestResponse():
     content_type = "application/json"
@@ -11,15 +13,19 @@ class RestResponse():
     
     @property
     def response(self):
-        return Response(
-            {
-                "data": self.__data,
-                "code": self.__code,
-                "message": self.__get_default_message(),
-            },
-            status=self.__status,
-            content_type=self.content_type
-        )
+        return Response(self.__body(), status=self.__status, content_type=self.content_type)
+
+    @property
+    def json_response(self):
+        """The same envelope as a plain Django response, for views outside DRF (async views)."""
+        return JsonResponse(self.__body(), status=self.__status, encoder=JSONEncoder, json_dumps_params={"ensure_ascii": False, "separators": (",", ":")})
+
+    def __body(self):
+        return {
+            "data": self.__data,
+            "code": self.__code,
+            "message": self.__get_default_message(),
+        }
     
     def __get_default_message(self):
         return self.__message or {
@@ -0,0 +1,47 @@
+"""
+Per-day result cache for reports over closed days.
+
+A report is split into one segment per day. Segments of past days never
+change once the day is over, so they are cached without expiry; today's
+segment is always computed live. Writes that touch a past day (e.g. a
+late bill) must call ``invalidate_day_segment``.
+"""
+from datetime import date
+from typing import Any, Callable, Dict, List
+from django.core.cache import cache
+
+from app_core.helpers.business_day import business_day
+
+EMPLOYEE_PERFORMANCE_SEGMENT = "employee_performance"
+
+def _segment_key(name: str, day: date) -> str:
+    return f"segment:{name}:{day.isoformat()}"
+
+def get_day_segments(name: str, days: List[date], compute: Callable[[List[date]], Dict[date, Any]]) -> Dict[date, Any]:
+    """Return ``{day: segment}`` for ``days``, calling ``compute(missing_days)`` only for days not cached.
+
+    ``compute`` must return a segment for every day it is given, empty days included,
+    so that they are cached as well.
+    """
+    today = business_day()
+    keys = {day: _segment_key(name, day) for day in days if day < today}
+    cached = cache.get_many(list(keys.values())) if keys else {}
+
+    segments = {}
+    missing = []
+    for day in days:
+        key = keys.get(day)
+        if key is not None and key in cached:
+            segments[day] = cached[key]
+        else:
+            missing.append(day)
+
+    if missing:
+        computed = compute(missing)
+        cache.set_many({keys[day]: computed[day] for day in missing if day in keys}, timeout=None)
+        segments.update(computed)
+
+    return segments
+
+def invalidate_day_segment(name: str, day: date):
+    cache.delete(_segment_key(name, day))
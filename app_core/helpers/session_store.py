@@ -0,0 +1,89 @@
+"""
+Redis layout:
+    session:{user_id}                      hash  {"access": jti, "refresh": jti}
+    session:{user_id}:{access|refresh}:{jti}   string, serialized user, expires with the token
+    otp:{purpose}:{email}                  string, the current OTP
+
+The per-user hash indexes the live token keys, so revoking or rotating a
+user's session never needs a KEYS scan.
+"""
+import json
+from typing import Any, Optional
+from django_redis import get_redis_connection
+from rest_framework_simplejwt.settings import api_settings as jwt_configs
+
+from app_core.helpers.async_redis import get_async_connection
+
+ACCESS = "access"
+REFRESH = "refresh"
+
+def _connection():
+    return get_redis_connection("default")
+
+def _index_key(user_id: Any) -> str:
+    return f"session:{user_id}"
+
+def _token_key(user_id: Any, token_type: str, jti: str) -> str:
+    return f"session:{user_id}:{token_type}:{jti}"
+
+def _ttl(token_type: str) -> int:
+    lifetime = jwt_configs.ACCESS_TOKEN_LIFETIME if token_type == ACCESS else jwt_configs.REFRESH_TOKEN_LIFETIME
+    return int(lifetime.total_seconds())
+
+def _delete_indexed_tokens(pipe, user_id: Any, index: dict):
+    for token_type, jti in index.items():
+        pipe.delete(_token_key(user_id, token_type.decode(), jti.decode()))
+
+def save_session(user_id: Any, data: Any, access_jti: str, refresh_jti: str):
+    """Replace the user's current access/refresh pair with a new one."""
+    conn = _connection()
+    index = conn.hgetall(_index_key(user_id))
+    payload = json.dumps(data)
+
+    pipe = conn.pipeline()
+    _delete_indexed_tokens(pipe, user_id, index)
+    pipe.set(_token_key(user_id, ACCESS, access_jti), payload, ex=_ttl(ACCESS))
+    pipe.set(_token_key(user_id, REFRESH, refresh_jti), payload, ex=_ttl(REFRESH))
+    pipe.hset(_index_key(user_id), mapping={ACCESS: access_jti, REFRESH: refresh_jti})
+    pipe.expire(_index_key(user_id), _ttl(REFRESH))
+    pipe.execute()
+
+def revoke_session(user_id: Any):
+    conn = _connection()
+    index = conn.hgetall(_index_key(user_id))
+
+    pipe = conn.pipeline()
+    _delete_indexed_tokens(pipe, user_id, index)
+    pipe.delete(_index_key(user_id))
+    pipe.execute()
+
+def update_session_data(user_id: Any, data: Any):
+    """Rewrite the payload of the user's live tokens, keeping their expiry."""
+    conn = _connection()
+    index = conn.hgetall(_index_key(user_id))
+    payload = json.dumps(data)
+
+    pipe = conn.pipeline()
+    for token_type, jti in index.items():
+        pipe.set(_token_key(user_id, token_type.decode(), jti.decode()), payload, keepttl=True, xx=True)
+    pipe.execute()
+
+def get_access_session(user_id: Any, jti: str) -> Optional[dict]:
+    payload = _connection().get(_token_key(user_id, ACCESS, jti))
+    return json.loads(payload) if payload is not None else None
+
+async def aget_access_session(user_id: Any, jti: str) -> Optional[dict]:
+    """``get_access_session`` for async views, on the event loop's Redis client."""
+    payload = await get_async_connection().get(_token_key(user_id, ACCESS, jti))
+    return json.loads(payload) if payload is not None else None
+
+def has_refresh_session(user_id: Any, jti: str) -> bool:
+    return bool(_connection().exists(_token_key(user_id, REFRESH, jti)))
+
+def save_otp(purpose: Any, email: str, otp: str, timeout: int):
+    """Store ``otp`` as the only valid code for this purpose and email."""
+    _connection().set(f"otp:{purpose}:{email}", otp, ex=timeout)
+
+def get_otp(purpose: Any, email: str) -> Optional[str]:
+    otp = _connection().get(f"otp:{purpose}:{email}")
+    return otp.decode() if otp is not None else None
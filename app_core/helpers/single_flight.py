@@ -0,0 +1,162 @@
+"""
+Single-flight coalescing with stale-while-revalidate for expensive GETs.
+
+``coalesced`` keeps a view's response in the cache (Redis), keyed by the view
+and its sorted query params. Within ``fresh_for`` seconds the stored response
+is served as is. For ``stale_for`` seconds after that it is still served,
+while one worker recomputes it in the background. With nothing stored, one
+worker computes it under a per-key lock and concurrent identical requests
+wait for its result instead of running the same queries. The wait is short
+(``WAIT_TIMEOUT``) since it holds the request's thread; past it, or right
+away under ASGI, where sync views share one thread, a request computes the
+response itself.
+
+Each request is counted as a hit, stale, wait or miss per view in the
+``single_flight:stats`` hash; ``manage.py single_flight_stats`` prints it.
+"""
+import functools
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connections
+from django_redis import get_redis_connection
+from rest_framework.response import Response
+
+from app_core.helpers.redis_lock import acquire_lock, release_lock
+from app_core.helpers.response import RestResponse
+
+STATS_KEY = "single_flight:stats"
+LOCK_TIMEOUT = 30
+WAIT_TIMEOUT = 0.5
+WAIT_INTERVAL = 0.05
+REFRESH_WORKERS = 2
+
+class FlightOutcome:
+    HIT = "hit"
+    STALE = "stale"
+    WAIT = "wait"
+    MISS = "miss"
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix="single-flight")
+    return _pool
+
+def _count(name: str, outcome: str):
+    # Counters are best effort, a Redis hiccup must not fail the read
+    try:
+        get_redis_connection("default").hincrby(STATS_KEY, f"{name}:{outcome}", 1)
+    except Exception as e:
+        logging.getLogger().exception("single_flight._count exc=%s, name=%s", e, name)
+
+def _store(entry_key: str, value: Any, fresh_for: int, stale_for: int):
+    cache.set(entry_key, {"value": value, "fresh_until": time.time() + fresh_for}, timeout=fresh_for + stale_for)
+
+def single_flight(
+    name: str,
+    key: str,
+    compute: Callable[[], Any],
+    fresh_for: int,
+    stale_for: int,
+    cacheable: Optional[Callable[[Any], bool]] = None,
+) -> Tuple[Any, str]:
+    """Return ``(value, outcome)`` for ``key``, running ``compute()`` at most once at a time across workers.
+
+    Values for which ``cacheable(value)`` is false are returned to their caller only.
+    """
+    entry_key = f"single_flight:{key}"
+    lock_key = f"{entry_key}:lock"
+
+    entry = cache.get(entry_key)
+    if entry is not None:
+        if time.time() < entry["fresh_until"]:
+            _count(name, FlightOutcome.HIT)
+            return entry["value"], FlightOutcome.HIT
+
+        token = acquire_lock(lock_key, LOCK_TIMEOUT)
+        if token is not None:
+            _get_pool().submit(_refresh, entry_key, lock_key, token, compute, fresh_for, stale_for, cacheable)
+        _count(name, FlightOutcome.STALE)
+        return entry["value"], FlightOutcome.STALE
+
+    token = acquire_lock(lock_key, LOCK_TIMEOUT)
+    deadline = time.monotonic() + (0 if settings.SERVE_ASGI else WAIT_TIMEOUT)
+    while token is None and time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        entry = cache.get(entry_key)
+        if entry is not None:
+            _count(name, FlightOutcome.WAIT)
+            return entry["value"], FlightOutcome.WAIT
+        # Taken over if the computing request finished without storing a value
+        token = acquire_lock(lock_key, LOCK_TIMEOUT)
+
+    try:
+        value = compute()
+        if cacheable is None or cacheable(value):
+            _store(entry_key, value, fresh_for, stale_for)
+        _count(name, FlightOutcome.MISS)
+        return value, FlightOutcome.MISS
+    finally:
+        if token is not None:
+            release_lock(lock_key, token)
+
+def _refresh(entry_key, lock_key, token, compute, fresh_for, stale_for, cacheable):
+    close_old_connections()
+    try:
+        value = compute()
+        if cacheable is None or cacheable(value):
+            _store(entry_key, value, fresh_for, stale_for)
+    except Exception as e:
+        logging.getLogger().exception("single_flight._refresh exc=%s, key=%s", e, entry_key)
+    finally:
+        release_lock(lock_key, token)
+        connections.close_all()
+
+def coalesced(fresh_for: int, stale_for: int, version: Optional[Callable[[], Any]] = None):
+    """Decorate a ViewSet GET action so identical requests share one computation of its response.
+
+    Only 200 responses are stored. ``version()``, when given, is part of the key, so
+    stored responses stop matching once it moves (e.g. the menu version).
+    """
+
+    def decorator(view_method):
+        name = view_method.__qualname__
+
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            params = urlencode(sorted(request.query_params.lists()), doseq=True)
+            key = f"{name}:{version() if version else ''}:{hashlib.sha256(params.encode()).hexdigest()}"
+
+            computed = {}
+
+            def compute():
+                response = view_method(self, request, *args, **kwargs)
+                computed["response"] = response
+                return {"status": response.status_code, "data": response.data}
+
+            stored, outcome = single_flight(
+                name, key, compute, fresh_for, stale_for,
+                cacheable=lambda value: value["status"] == 200,
+            )
+            if outcome == FlightOutcome.MISS:
+                # Computed by this request: send it as the view built it, headers included
+                response = computed["response"]
+            else:
+                response = Response(stored["data"], status=stored["status"], content_type=RestResponse.content_type)
+            response["X-Cache"] = outcome
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,29 @@
+"""
+Version counter of the day's stock figures.
+
+``stock:version`` in Redis moves after every committed write that changes a
+sold or planned quantity: ``DailyQuantity`` reserves, releases, recounts and
+plan saves call ``bump_stock_version``. Responses that carry
+``sold_quantity_today``/``remaining_quantity_today`` put ``get_stock_version``
+in their cache key, so they stop matching once the figures change. The
+business day is part of the version, so the figures also reset at the cutoff.
+"""
+from django.db import transaction
+from django_redis import get_redis_connection
+
+from app_core.helpers.business_day import business_day
+
+STOCK_VERSION_KEY = "stock:version"
+
+def _incr():
+    get_redis_connection("default").incr(STOCK_VERSION_KEY)
+
+def get_stock_version() -> str:
+    version = get_redis_connection("default").get(STOCK_VERSION_KEY)
+    return f"{business_day().isoformat()}:{int(version) if version is not None else 0}"
+
+def bump_stock_version():
+    """Move the version once the current transaction commits, so a response computed
+    under the new version sees the write."""
+    # robust: a Redis hiccup must not turn an order that was committed into a 500
+    transaction.on_commit(_incr, robust=True)
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app_core.models.order_item import OrderItem
+
+BATCH_SIZE = 500
+
+class Command(BaseCommand):
+    help = "Fill order_items.unit_price for items created before prices were captured, from the current dish/combo prices."
+
+    def handle(self, *args, **options):
+        updated = 0
+        last_id = 0
+        while True:
+            batch = list(
+                OrderItem.objects.filter(unit_price=None, id__gt=last_id)
+                .with_unit_price()
+                .order_by('id')[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+
+            for item in batch:
+                item.unit_price = item.effective_unit_price
+            with transaction.atomic():
+                OrderItem.objects.bulk_update(batch, ['unit_price'])
+
+            updated += len(batch)
+            last_id = batch[-1].id
+
+        self.stdout.write(self.style.SUCCESS(f"Filled unit price of {updated} order item(s)"))
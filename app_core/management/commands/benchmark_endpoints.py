@@ -0,0 +1,62 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from django.core.management.base import BaseCommand
+
+class Command(BaseCommand):
+    help = (
+        "Load a running server with GET requests and report requests/sec and latency per path. "
+        "Run it once against the WSGI server and once against the ASGI one, on the same cores, "
+        "e.g. --path /apis/dishes --path /apis/async/dishes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--token", required=True, help="access token sent as the Bearer header")
+        parser.add_argument("--path", action="append", required=True, dest="paths", help="repeatable")
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--duration", type=float, default=10, help="seconds per path")
+        parser.add_argument("--warmup", type=float, default=2, help="seconds per path before measuring")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'path':<40} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for path in options["paths"]:
+            url = options["base_url"].rstrip("/") + path
+            self.__run(url, options, options["warmup"])
+            latencies, errors, elapsed = self.__run(url, options, options["duration"])
+
+            quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+            self.stdout.write(
+                f"{path:<40} {len(latencies) + errors:>9} {errors:>7} {(len(latencies) + errors) / elapsed:>9.1f}"
+                f" {quantiles[49] * 1000:>8.1f} {quantiles[94] * 1000:>8.1f} {quantiles[98] * 1000:>8.1f}"
+            )
+
+    def __run(self, url, options, duration):
+        latencies = []
+        errors = [0]
+        lock = threading.Lock()
+        deadline = time.monotonic() + duration
+        headers = {"Authorization": f"Bearer {options['token']}"}
+
+        def worker():
+            session = requests.Session()
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    ok = session.get(url, headers=headers, timeout=30).status_code < 400
+                except requests.RequestException:
+                    ok = False
+                latency = time.perf_counter() - started
+                with lock:
+                    if ok:
+                        latencies.append(latency)
+                    else:
+                        errors[0] += 1
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            for _ in range(options["concurrency"]):
+                pool.submit(worker)
+        return latencies, errors[0], time.monotonic() - started
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Q
+
+from app_core.models.order import Order, OrderStatus
+
+class Command(BaseCommand):
+    help = "Compare orders.subtotal/item_count with their live items and optionally repair the drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--status", choices=OrderStatus.values, help="only check orders in this status")
+        parser.add_argument("--repair", action="store_true", help="write the recomputed totals")
+
+    def handle(self, *args, **options):
+        orders = Order.objects.all()
+        if options["status"]:
+            orders = orders.filter(status=options["status"])
+
+        drifted = list(
+            orders.with_computed_totals()
+            .filter(~Q(subtotal=F('computed_subtotal')) | ~Q(item_count=F('computed_item_count')))
+            .order_by('id')
+            .values('id', 'subtotal', 'computed_subtotal', 'item_count', 'computed_item_count')
+        )
+
+        for row in drifted:
+            self.stdout.write(
+                f"order {row['id']}: subtotal {row['subtotal']} (expected {row['computed_subtotal']}),"
+                f" item_count {row['item_count']} (expected {row['computed_item_count']})"
+            )
+
+        if options["repair"] and drifted:
+            repaired = 0
+            for order_id in [row['id'] for row in drifted]:
+                # Recompute under the order lock so a concurrent item change cannot be lost
+                with transaction.atomic():
+                    order = Order.objects.select_for_update().get(pk=order_id)
+                    totals = Order.objects.filter(pk=order_id).with_computed_totals().values('computed_subtotal', 'computed_item_count').get()
+                    order.subtotal = totals['computed_subtotal']
+                    order.item_count = totals['computed_item_count']
+                    order.save(update_fields=['subtotal', 'item_count'])
+                    repaired += 1
+            self.stdout.write(self.style.SUCCESS(f"Repaired {repaired} order(s)"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{len(drifted)} order(s) with drifted totals"))
@@ -0,0 +1,30 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from app_core.helpers.query_plans import check_hot_queries, SUPPORTED_VENDORS
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the hot query shapes and fail if one of them reads its whole table instead of an index. "
+        "Planners pick full scans on tiny tables, so run it against a database with realistic data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--show-plans", action="store_true", help="print every plan")
+
+    def handle(self, *args, **options):
+        if connection.vendor not in SUPPORTED_VENDORS:
+            raise CommandError(f"Unsupported database backend: {connection.vendor}")
+
+        failures = []
+        for label, plan, uses_index in check_hot_queries():
+            self.stdout.write(f"{'index' if uses_index else 'SCAN ':<6} {label}")
+            if options["show_plans"] or not uses_index:
+                self.stdout.write(plan if isinstance(plan, str) else json.dumps(plan, indent=2))
+            if not uses_index:
+                failures.append(label)
+
+        if failures:
+            raise CommandError(f"{len(failures)} hot query shape(s) scan their table: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("Every hot query shape uses an index"))
@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Sum
+
+from app_core.models.order_item import OrderItem
+from app_core.models.daily_item_sales import DailyItemSales
+from app_core.helpers.business_day import business_day_of, day_start
+
+class Command(BaseCommand):
+    help = "Rebuild the daily_item_sales rollup from billed orders (whole history, or the given date range)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start-date", help="yyyy-mm-dd, inclusive")
+        parser.add_argument("--end-date", help="yyyy-mm-dd, inclusive")
+
+    def handle(self, *args, **options):
+        try:
+            start_date = datetime.strptime(options["start_date"], "%Y-%m-%d").date() if options["start_date"] else None
+            end_date = datetime.strptime(options["end_date"], "%Y-%m-%d").date() if options["end_date"] else None
+        except ValueError:
+            raise CommandError("Dates must be in yyyy-mm-dd format")
+
+        # Bill conditions go into a single filter() so they share one join on bills.
+        item_filters = {"deleted_at": None, "order__bills__isnull": False}
+        rollups = DailyItemSales.objects.all()
+        if start_date:
+            item_filters["order__bills__created_at__gte"] = day_start(start_date)
+            rollups = rollups.filter(date__gte=start_date)
+        if end_date:
+            item_filters["order__bills__created_at__lt"] = day_start(end_date + timedelta(days=1))
+            rollups = rollups.filter(date__lte=end_date)
+
+        rows = (
+            OrderItem.objects.filter(**item_filters).annotate(day=business_day_of('order__bills__created_at'))
+            .values('day', 'type', 'dish_id', 'combo_id')
+            .annotate(quantity=Sum('quantity'))
+        )
+
+        with transaction.atomic():
+            rollups.delete()
+            DailyItemSales.objects.bulk_create([
+                DailyItemSales(date=r['day'], type=r['type'], dish_id=r['dish_id'], combo_id=r['combo_id'], quantity=r['quantity'])
+                for r in rows
+            ], batch_size=500)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(rows)} item sales row(s)"))
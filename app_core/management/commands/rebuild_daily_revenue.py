@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from app_core.models.bill import Bill
+from app_core.models.daily_revenue import DailyRevenue
+from app_core.helpers.business_day import business_day_of, day_start
+
+class Command(BaseCommand):
+    help = "Rebuild the daily_revenues rollup from bills (whole history, or the given date range)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start-date", help="yyyy-mm-dd, inclusive")
+        parser.add_argument("--end-date", help="yyyy-mm-dd, inclusive")
+
+    def handle(self, *args, **options):
+        try:
+            start_date = datetime.strptime(options["start_date"], "%Y-%m-%d").date() if options["start_date"] else None
+            end_date = datetime.strptime(options["end_date"], "%Y-%m-%d").date() if options["end_date"] else None
+        except ValueError:
+            raise CommandError("Dates must be in yyyy-mm-dd format")
+
+        bills = Bill.objects.all()
+        rollups = DailyRevenue.objects.all()
+        if start_date:
+            bills = bills.filter(created_at__gte=day_start(start_date))
+            rollups = rollups.filter(date__gte=start_date)
+        if end_date:
+            bills = bills.filter(created_at__lt=day_start(end_date + timedelta(days=1)))
+            rollups = rollups.filter(date__lte=end_date)
+
+        rows = (
+            bills.annotate(day=business_day_of('created_at'))
+            .values('day')
+            .annotate(bill_count=Count('id'), revenue=Sum('total_amount'))
+        )
+
+        with transaction.atomic():
+            rollups.delete()
+            DailyRevenue.objects.bulk_create([
+                DailyRevenue(date=r['day'], bill_count=r['bill_count'], revenue=r['revenue'])
+                for r in rows
+            ], batch_size=500)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(rows)} day(s) of revenue"))
@@ -0,0 +1,23 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from app_core.models.daily_quantity import DailyQuantity
+from app_core.helpers.business_day import business_day
+
+class Command(BaseCommand):
+    help = "Recompute the sold counters of daily_quantities from order items (today, or the given date)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="yyyy-mm-dd, defaults to the current business day")
+
+    def handle(self, *args, **options):
+        try:
+            day = datetime.strptime(options["date"], "%Y-%m-%d").date() if options["date"] else business_day()
+        except ValueError:
+            raise CommandError("Date must be in yyyy-mm-dd format")
+
+        with transaction.atomic():
+            plans = DailyQuantity.recount_sold(day, DailyQuantity.objects.select_for_update().filter(date=day))
+
+        self.stdout.write(self.style.SUCCESS(f"Recounted {len(plans)} plan(s) for {day.isoformat()}"))
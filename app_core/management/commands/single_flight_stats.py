@@ -0,0 +1,29 @@
+from collections import defaultdict
+from django.core.management.base import BaseCommand
+from django_redis import get_redis_connection
+
+from app_core.helpers.single_flight import STATS_KEY, FlightOutcome
+
+OUTCOMES = (FlightOutcome.HIT, FlightOutcome.STALE, FlightOutcome.WAIT, FlightOutcome.MISS)
+
+class Command(BaseCommand):
+    help = "Print how often each coalesced view was served fresh (hit), stale, after waiting on another worker, or computed (miss)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="zero the counters after printing them")
+
+    def handle(self, *args, **options):
+        conn = get_redis_connection("default")
+        counts = defaultdict(dict)
+        for field, value in conn.hgetall(STATS_KEY).items():
+            name, _, outcome = field.decode().rpartition(":")
+            counts[name][outcome] = int(value)
+
+        self.stdout.write(f"{'view':<45}" + "".join(f"{outcome:>9}" for outcome in OUTCOMES) + f"{'served':>9}")
+        for name in sorted(counts):
+            row = [counts[name].get(outcome, 0) for outcome in OUTCOMES]
+            served = sum(row) - counts[name].get(FlightOutcome.MISS, 0)
+            self.stdout.write(f"{name:<45}" + "".join(f"{count:>9}" for count in row) + f"{served / max(sum(row), 1):>9.0%}")
+
+        if options["reset"]:
+            conn.delete(STATS_KEY)
@@ -2,9 +2,77 @@ from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import NotAuthenticated, AuthenticationFailed
 from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.exceptions import TokenError
-from django.core.cache import cache
 
-from app_core.models.user import User
+from app_core.helpers import session_store
+from app_core.helpers.lru_cache import TTLLRUCache
+from app_core.models.user import User, UserStatus
+
+# Principals resolved from the session store, keyed by access token jti.
+# The short TTL bounds how long another worker may serve a revoked token.
+principal_cache = TTLLRUCache(maxsize=2048, ttl=15)
+
+def invalidate_principal(user_id: int):
+    principal_cache.delete_where(lambda account: account.id == user_id)
+
+def build_principal(session: dict) -> User:
+    """Build an unsaved-looking User from the session payload, without touching the database."""
+    account = User(
+        id=session["id"],
+        employee_code=session.get("employee_code"),
+        fullname=session.get("fullname"),
+        email=session.get("email"),
+        phone=session.get("phone"),
+        gender=session.get("gender"),
+        status=session.get("status"),
+        role=session.get("role"),
+    )
+    account._state.adding = False
+    account._state.db = "default"
+    return account
+
+def _decode_access_token(token: str):
+    try:
+        payload = AccessToken(token=token).payload
+        return payload.get("user_id", None), payload["jti"]
+    except TokenError:
+        raise AuthenticationFailed("Verify token failed!")
+
+def _check_principal(account: User) -> User:
+    if account.status != UserStatus.ACTIVATED:
+        raise AuthenticationFailed("Verify token failed!")
+    return account
+
+def authenticate_token(token: str) -> User:
+    """Resolve an access token to its principal, or raise ``AuthenticationFailed``."""
+    user_id, jti = _decode_access_token(token)
+    account = principal_cache.get(jti)
+
+    if account is None:
+        session = session_store.get_access_session(user_id, jti)
+
+        if session is None:
+            raise AuthenticationFailed("Verify token failed!")
+
+        account = build_principal(session)
+        principal_cache.set(jti, account)
+
+    return _check_principal(account)
+
+async def aauthenticate_token(token: str) -> User:
+    """``authenticate_token`` for async views: the session lookup goes through the async Redis client."""
+    user_id, jti = _decode_access_token(token)
+    account = principal_cache.get(jti)
+
+    if account is None:
+        session = await session_store.aget_access_session(user_id, jti)
+
+        if session is None:
+            raise AuthenticationFailed("Verify token failed!")
+
+        account = build_principal(session)
+        principal_cache.set(jti, account)
+
+    return _check_principal(account)
 
 class UserAuthentication(BaseAuthentication):
     def authenticate(self, request):
@@ -12,18 +80,6 @@ class UserAuthentication(BaseAuthentication):
 
         if bearer_token is None:
             raise NotAuthenticated("Missing token!")
-        
-        token = bearer_token.replace("Bearer ", "")
-
-        try:
-            user_id = AccessToken(token=token).payload.get("user_id", None)
-            jti = AccessToken(token=token).payload["jti"]
-        except TokenError:
-            raise AuthenticationFailed("Verify token failed!")
 
-        if not bool(cache.has_key(f"session:{user_id}:access:{jti}")):
-            raise AuthenticationFailed("Verify token failed!")
-        
-        account = User.objects.get(id=user_id)
-        
-        return (account, token)
\ No newline at end of file
+        token = bearer_token.replace("Bearer ", "")
+        return (authenticate_token(token), token)
@@ -0,0 +1,208 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:22
+
+import django.core.validators
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('employee_code', models.CharField(max_length=255, unique=True)),
+                ('fullname', models.CharField(max_length=255)),
+                ('birth_date', models.DateField(null=True)),
+                ('gender', models.CharField(choices=[('male', 'Male'), ('female', 'Female'), ('other', 'Other')], default='other', max_length=20)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('phone', models.CharField(max_length=15)),
+                ('status', models.CharField(choices=[('blocked', 'Blocked'), ('activated', 'Activated'), ('unverified', 'Unverified')], max_length=20)),
+                ('role', models.CharField(choices=[('manager', 'Manager'), ('employee', 'Employee')], max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'users',
+            },
+        ),
+        migrations.CreateModel(
+            name='Combo',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255)),
+                ('image', models.ImageField(default=None, null=True, upload_to='combos/')),
+                ('discount', models.IntegerField(validators=[django.core.validators.MinValueValidator(0)])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(default=None, null=True)),
+            ],
+            options={
+                'db_table': 'combos',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyRevenue',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('date', models.DateField(unique=True)),
+                ('bill_count', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'daily_revenues',
+            },
+        ),
+        migrations.CreateModel(
+            name='DiningTable',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('code', models.CharField(max_length=255)),
+                ('number_of_seats', models.IntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(default=None, null=True)),
+            ],
+            options={
+                'db_table': 'dining_tables',
+            },
+        ),
+        migrations.CreateModel(
+            name='Dish',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255)),
+                ('image', models.ImageField(default=None, null=True, upload_to='dishes/')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('status', models.CharField(choices=[('selling', 'Selling'), ('stop_selling', 'Stop Selling')], default='selling', max_length=20)),
+                ('type', models.CharField(choices=[('appetizer', 'Appetizer'), ('main_course', 'Main Course'), ('dessert', 'Dessert'), ('drink', 'Drink'), ('other', 'Other')], default='main_course', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(default=None, null=True)),
+            ],
+            options={
+                'db_table': 'dishes',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyQuantity',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('type', models.CharField(choices=[('dish', 'Dish'), ('combo', 'Combo')], max_length=20)),
+                ('quantity', models.IntegerField(validators=[django.core.validators.MinValueValidator(0)])),
+                ('sold', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0)])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('combo', models.ForeignKey(default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_quantities', to='app_core.combo')),
+                ('dish', models.ForeignKey(default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_quantities', to='app_core.dish')),
+            ],
+            options={
+                'db_table': 'daily_quantities',
+            },
+        ),
+        migrations.CreateModel(
+            name='ComboDish',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('quantity', models.IntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(default=None, null=True)),
+                ('combo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='combo_dishes', to='app_core.combo')),
+                ('dish', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='combo_dishes', to='app_core.dish')),
+            ],
+            options={
+                'db_table': 'combo_dishes',
+            },
+        ),
+        migrations.AddField(
+            model_name='combo',
+            name='dishes',
+            field=models.ManyToManyField(related_name='combos', through='app_core.ComboDish', to='app_core.dish'),
+        ),
+        migrations.CreateModel(
+            name='Order',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('customer_name', models.CharField(max_length=255)),
+                ('customer_phone', models.CharField(max_length=15)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], default='pending', max_length=20)),
+                ('finished_at', models.DateTimeField(default=None, null=True)),
+                ('note', models.TextField(default=None, null=True)),
+                ('subtotal', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('item_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('dining_table', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='orders', to='app_core.diningtable')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='orders_served', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'orders',
+            },
+        ),
+        migrations.CreateModel(
+            name='Bill',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('total_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bills', to=settings.AUTH_USER_MODEL)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bills', to='app_core.order')),
+            ],
+            options={
+                'db_table': 'bills',
+            },
+        ),
+        migrations.CreateModel(
+            name='OrderItem',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('type', models.CharField(choices=[('dish', 'Dish'), ('combo', 'Combo')], max_length=20)),
+                ('quantity', models.IntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('unit_price', models.DecimalField(decimal_places=2, default=None, max_digits=12, null=True)),
+                ('note', models.TextField(default=None, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(default=None, null=True)),
+                ('combo', models.ForeignKey(default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='order_items', to='app_core.combo')),
+                ('dish', models.ForeignKey(default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='order_items', to='app_core.dish')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='order_items', to='app_core.order')),
+            ],
+            options={
+                'db_table': 'order_items',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyItemSales',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('type', models.CharField(choices=[('dish', 'Dish'), ('combo', 'Combo')], max_length=20)),
+                ('quantity', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('combo', models.ForeignKey(default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='app_core.combo')),
+                ('dish', models.ForeignKey(default=None, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='app_core.dish')),
+            ],
+            options={
+                'db_table': 'daily_item_sales',
+                'constraints': [models.UniqueConstraint(fields=('date', 'dish'), name='daily_item_sales_date_dish_uniq'), models.UniqueConstraint(fields=('date', 'combo'), name='daily_item_sales_date_combo_uniq')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['status', 'subtotal'], name='orders_status_subtotal_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:22
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def delete_duplicate_daily_quantities(apps, schema_editor):
+    """The daily quantity upsert used to race, so keep only the oldest plan per (date, item)."""
+    DailyQuantity = apps.get_model('app_core', 'DailyQuantity')
+    for field in ('dish', 'combo'):
+        keep = (
+            DailyQuantity.objects.filter(**{f'{field}__isnull': False})
+            .values('date', field)
+            .annotate(keep_id=Min('id'))
+            .values_list('keep_id', flat=True)
+        )
+        DailyQuantity.objects.filter(**{f'{field}__isnull': False}).exclude(id__in=list(keep)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bill',
+            index=models.Index(fields=['created_at'], name='bills_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['dining_table', 'status', 'created_at'], name='orders_table_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderitem',
+            index=models.Index(condition=models.Q(('deleted_at', None)), fields=['order', 'deleted_at'], name='order_items_live_order_idx'),
+        ),
+        migrations.RunPython(delete_duplicate_daily_quantities, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='dailyquantity',
+            constraint=models.UniqueConstraint(fields=('date', 'dish'), name='daily_quantities_date_dish_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyquantity',
+            constraint=models.UniqueConstraint(fields=('date', 'combo'), name='daily_quantities_date_combo_uniq'),
+        ),
+    ]
@@ -1 +1,11 @@
-from app_core.models.user import User
\ No newline at end of file
+from app_core.models.user import User
+from app_core.models.dish import Dish
+from app_core.models.combo import Combo
+from app_core.models.combo_dish import ComboDish
+from app_core.models.dining_table import DiningTable
+from app_core.models.order import Order
+from app_core.models.order_item import OrderItem
+from app_core.models.bill import Bill
+from app_core.models.daily_quantity import DailyQuantity
+from app_core.models.daily_revenue import DailyRevenue
+from app_core.models.daily_item_sales import DailyItemSales
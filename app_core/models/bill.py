@@ -5,6 +5,9 @@ from app_core.models.user import User
 class Bill(models.Model):
     class Meta:
         db_table = "bills"
+        indexes = [
+            models.Index(fields=["created_at"], name="bills_created_at_idx"),
+        ]
 
     id = models.AutoField(primary_key=True)
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="bills")
@@ -1,9 +1,49 @@
+from decimal import Decimal
 from django.db import models
+from django.db.models import DecimalField, ExpressionWrapper, F, OuterRef, Prefetch, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.conf import settings
 
 from app_core.models.dish import Dish
 
+def combo_price_expression(combo_ref='pk', discount_ref='discount'):
+    """SQL for sum(dish price x quantity) of the live dishes of a combo - its discount.
+
+    ``combo_ref`` and ``discount_ref`` name the combo id and discount on the
+    outer query, so the same expression serves ``Combo.objects.with_price()``
+    and queries over order items.
+    """
+    from app_core.models.combo_dish import ComboDish
+
+    dishes_total = (
+        ComboDish.objects.filter(combo=OuterRef(combo_ref), deleted_at=None)
+        .values('combo')
+        .annotate(total=Sum(F('dish__price') * F('quantity'), output_field=DecimalField(max_digits=12, decimal_places=2)))
+        .values('total')
+    )
+    return ExpressionWrapper(
+        Coalesce(Subquery(dishes_total), Value(Decimal(0))) - F(discount_ref),
+        output_field=DecimalField(max_digits=12, decimal_places=2)
+    )
+
+class ComboQuerySet(models.QuerySet):
+    def with_price(self):
+        """Annotate ``annotated_price`` = sum(dish price x quantity) of live combo dishes - discount."""
+        return self.annotate(annotated_price=combo_price_expression())
+
+    def with_live_dishes(self):
+        """Prefetch live combo dishes with their dish into ``live_combo_dishes``."""
+        from app_core.models.combo_dish import ComboDish
+
+        return self.prefetch_related(
+            Prefetch(
+                'combo_dishes',
+                queryset=ComboDish.objects.filter(deleted_at=None).select_related('dish'),
+                to_attr='live_combo_dishes'
+            )
+        )
+
 class Combo(models.Model):
     class Meta:
         db_table = "combos"
@@ -17,9 +57,13 @@ class Combo(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, default=None)
 
+    objects = ComboQuerySet.as_manager()
+
     def get_image(self):
         return f"{settings.APP_DOMAIN}{self.image.url}"
     
     @property
     def price(self):
-        return sum(combo_dish.dish.price * combo_dish.quantity for combo_dish in self.combo_dishes.filter(deleted_at=None)) - self.discount
\ No newline at end of file
+        if hasattr(self, 'annotated_price'):
+            return self.annotated_price
+        return Combo.objects.with_price().values_list('annotated_price', flat=True).get(pk=self.pk)
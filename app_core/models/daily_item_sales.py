@@ -0,0 +1,35 @@
+from collections import defaultdict
+from django.db import models
+from django.db.models import F
+
+from app_core.models.dish import Dish
+from app_core.models.combo import Combo
+from app_core.models.order_item import OrderItemType
+
+class DailyItemSales(models.Model):
+    class Meta:
+        db_table = "daily_item_sales"
+        constraints = [
+            models.UniqueConstraint(fields=["date", "dish"], name="daily_item_sales_date_dish_uniq"),
+            models.UniqueConstraint(fields=["date", "combo"], name="daily_item_sales_date_combo_uniq"),
+        ]
+
+    id = models.AutoField(primary_key=True)
+    date = models.DateField()
+    type = models.CharField(max_length=20, choices=OrderItemType.choices)
+    dish = models.ForeignKey(Dish, on_delete=models.CASCADE, null=True, default=None, related_name="daily_sales")
+    combo = models.ForeignKey(Combo, on_delete=models.CASCADE, null=True, default=None, related_name="daily_sales")
+    quantity = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def add_order_items(cls, day, order_items):
+        """Add the quantities of a finalized order's live items to ``day``. Call inside the bill transaction."""
+        totals = defaultdict(int)
+        for item in order_items:
+            totals[(item.type, item.dish_id, item.combo_id)] += item.quantity
+
+        for (item_type, dish_id, combo_id), quantity in totals.items():
+            lookup = {"date": day, "dish_id": dish_id} if item_type == OrderItemType.DISH else {"date": day, "combo_id": combo_id}
+            cls.objects.get_or_create(**lookup, defaults={"type": item_type})
+            cls.objects.filter(**lookup).update(quantity=F("quantity") + quantity)
@@ -1,9 +1,13 @@
 from django.db import models
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError
+from django.db.models import F, Sum, Value
+from django.db.models.functions import Greatest
 
 from app_core.models.dish import Dish
 from app_core.models.combo import Combo
+from app_core.errors.exceptions import OutOfStockException
+from app_core.helpers.stock_version import bump_stock_version
 
 class DailyQuantityType(models.TextChoices):
     DISH = "dish"
@@ -12,6 +16,10 @@ class DailyQuantityType(models.TextChoices):
 class DailyQuantity(models.Model):
     class Meta:
         db_table = "daily_quantities"
+        constraints = [
+            models.UniqueConstraint(fields=["date", "dish"], name="daily_quantities_date_dish_uniq"),
+            models.UniqueConstraint(fields=["date", "combo"], name="daily_quantities_date_combo_uniq"),
+        ]
 
     id = models.AutoField(primary_key=True)
     date = models.DateField()
@@ -19,6 +27,7 @@ class DailyQuantity(models.Model):
     dish = models.ForeignKey(Dish, on_delete=models.CASCADE, null=True, default=None, related_name="daily_quantities")
     combo = models.ForeignKey(Combo, on_delete=models.CASCADE, null=True, default=None, related_name="daily_quantities")
     quantity = models.IntegerField(validators=[MinValueValidator(0)])
+    sold = models.IntegerField(default=0, validators=[MinValueValidator(0)])
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -38,4 +47,101 @@ class DailyQuantity(models.Model):
     def save(self, *args, **kwargs):
         self.clean()
         super().save(*args, **kwargs)
+        bump_stock_version()
 
+    @property
+    def remaining(self):
+        return max(0, self.quantity - self.sold)
+
+    @staticmethod
+    def _item_filter(item_type, item_id):
+        return {"dish_id": item_id} if item_type == DailyQuantityType.DISH else {"combo_id": item_id}
+
+    @classmethod
+    def reserve(cls, day, item_type, item_id, quantity):
+        """Take ``quantity`` portions of the day's stock, or raise ``OutOfStockException``.
+
+        The check and the decrement are a single conditional UPDATE, so concurrent
+        orders cannot both take the last portion. Items without a plan for the day
+        are not limited. Call inside the transaction that writes the order items.
+        """
+        if quantity <= 0:
+            return cls.release(day, item_type, item_id, -quantity)
+
+        # Unplanned items too: their sold figure is counted from the order items
+        bump_stock_version()
+        plan = cls.objects.filter(date=day, **cls._item_filter(item_type, item_id))
+        if plan.filter(sold__lte=F('quantity') - quantity).update(sold=F('sold') + quantity):
+            return
+        if plan.exists():
+            raise OutOfStockException(item_type, item_id)
+
+    @classmethod
+    def release(cls, day, item_type, item_id, quantity):
+        """Give back ``quantity`` portions taken with ``reserve``."""
+        if quantity <= 0:
+            return
+        bump_stock_version()
+        cls.objects.filter(date=day, **cls._item_filter(item_type, item_id)).update(
+            sold=Greatest(F('sold') - quantity, Value(0))
+        )
+
+    @classmethod
+    def reserve_items(cls, day, items):
+        """``reserve`` for a batch of order items, one UPDATE per distinct dish or combo."""
+        cls.apply_changes(day, cls._group(items))
+
+    @classmethod
+    def release_items(cls, day, items):
+        cls.apply_changes(day, {key: -quantity for key, quantity in cls._group(items).items()})
+
+    @classmethod
+    def apply_changes(cls, day, changes):
+        """Apply net stock changes ``{(type, item_id): delta}``; positive deltas reserve, negative release.
+
+        Releases run first so that portions given back in a batch can be taken again by the same batch.
+        """
+        for (item_type, item_id), delta in sorted(changes.items(), key=lambda change: change[1]):
+            cls.reserve(day, item_type, item_id, delta)
+
+    @classmethod
+    def recount_sold(cls, day, plans=None):
+        """Recompute ``sold`` of the day's plans (all of them, or ``plans``) from the live order items.
+
+        Used when a plan is created after orders were already taken, and to
+        reconcile the counters after a manual data fix. Call inside a transaction,
+        with ``plans`` locked by ``select_for_update``: a reservation that commits
+        between the count and the write would otherwise be overwritten.
+        """
+        from app_core.models.order import OrderStatus
+        from app_core.models.order_item import OrderItem
+        from app_core.helpers.business_day import window_filter
+
+        rows = (
+            OrderItem.objects.filter(
+                deleted_at=None,
+                **window_filter("order__created_at", day),
+                order__status__in=[OrderStatus.PENDING, OrderStatus.COMPLETED]
+            )
+            .values('type', 'dish_id', 'combo_id')
+            .annotate(total=Sum('quantity'))
+        )
+        sold = {}
+        for r in rows:
+            key = (r['type'], r['dish_id'] if r['type'] == DailyQuantityType.DISH else r['combo_id'])
+            sold[key] = sold.get(key, 0) + r['total']
+
+        plans = list(plans) if plans is not None else list(cls.objects.filter(date=day))
+        for plan in plans:
+            plan.sold = sold.get((plan.type, plan.dish_id or plan.combo_id), 0)
+        cls.objects.bulk_update(plans, ['sold'])
+        bump_stock_version()
+        return plans
+
+    @staticmethod
+    def _group(items):
+        totals = {}
+        for item in items:
+            key = (item.type, item.item_id)
+            totals[key] = totals.get(key, 0) + item.quantity
+        return totals
@@ -0,0 +1,19 @@
+from decimal import Decimal
+from django.db import models
+from django.db.models import F
+
+class DailyRevenue(models.Model):
+    class Meta:
+        db_table = "daily_revenues"
+
+    id = models.AutoField(primary_key=True)
+    date = models.DateField(unique=True)
+    bill_count = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal(0))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def add_bill(cls, day, amount):
+        """Count one bill of ``amount`` on ``day``. Call inside the transaction that creates the bill."""
+        cls.objects.get_or_create(date=day)
+        cls.objects.filter(date=day).update(bill_count=F('bill_count') + 1, revenue=F('revenue') + amount)
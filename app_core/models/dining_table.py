@@ -1,4 +1,39 @@
+from decimal import Decimal
 from django.db import models
+from django.db.models import Case, DecimalField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+class DiningTableStatus(models.TextChoices):
+    AVAILABLE = "available"
+    OCCUPIED = "occupied"
+
+class DiningTableQuerySet(models.QuerySet):
+    def with_floor_status(self):
+        """Annotate the table's pending order: ``current_order_id``, ``occupied_since``,
+        ``item_count`` (portions of live items), ``subtotal`` and ``floor_status``.
+
+        Everything is correlated subqueries on the order's stored totals, so the floor map is one query.
+        """
+        from app_core.models.order import Order, OrderStatus
+
+        pending_order = Order.objects.filter(dining_table=OuterRef('pk'), status=OrderStatus.PENDING).order_by('-created_at')[:1]
+
+        return self.annotate(
+            current_order_id=Subquery(pending_order.values('id')),
+            occupied_since=Subquery(pending_order.values('created_at')),
+            item_count=Coalesce(Subquery(pending_order.values('item_count')), Value(0)),
+            subtotal=Coalesce(
+                Subquery(pending_order.values('subtotal')),
+                Value(Decimal(0)),
+                output_field=DecimalField(max_digits=14, decimal_places=2)
+            ),
+        ).annotate(
+            floor_status=Case(
+                When(current_order_id__isnull=False, then=Value(DiningTableStatus.OCCUPIED)),
+                default=Value(DiningTableStatus.AVAILABLE),
+                output_field=models.CharField()
+            )
+        )
 
 class DiningTable(models.Model):
     class Meta:
@@ -9,4 +44,6 @@ class DiningTable(models.Model):
     number_of_seats = models.IntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    deleted_at = models.DateTimeField(null=True, default=None)
\ No newline at end of file
+    deleted_at = models.DateTimeField(null=True, default=None)
+
+    objects = DiningTableQuerySet.as_manager()
\ No newline at end of file
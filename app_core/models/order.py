@@ -1,16 +1,57 @@
+from decimal import Decimal
 from django.db import models
+from django.db.models import DecimalField, F, IntegerField, OuterRef, Prefetch, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 
 from app_core.models.user import User
 from app_core.models.dining_table import DiningTable
+from app_core.helpers.business_day import business_day
 
 class OrderStatus(models.TextChoices):
     PENDING = "pending"
     COMPLETED = "completed"
     CANCELLED = "cancelled"
 
+class OrderQuerySet(models.QuerySet):
+    def for_read(self):
+        """Load everything OrderSerializer touches: live items with their prices, table and employee."""
+        from app_core.models.order_item import OrderItem
+
+        return self.select_related('dining_table', 'employee').prefetch_related(
+            Prefetch(
+                'order_items',
+                queryset=OrderItem.objects.filter(deleted_at=None).with_prices(),
+                to_attr='live_order_items'
+            )
+        )
+
+    def with_computed_totals(self):
+        """Annotate ``computed_subtotal`` and ``computed_item_count`` from the live items, in SQL.
+
+        Used to check the stored ``subtotal``/``item_count`` for drift.
+        """
+        from app_core.models.order_item import OrderItem
+
+        live_items = OrderItem.objects.filter(order=OuterRef('pk'), deleted_at=None)
+        return self.annotate(
+            computed_subtotal=Coalesce(
+                Subquery(live_items.with_line_total().values('order').annotate(total=Sum('line_total')).values('total')),
+                Value(Decimal(0)),
+                output_field=DecimalField(max_digits=14, decimal_places=2)
+            ),
+            computed_item_count=Coalesce(
+                Subquery(live_items.values('order').annotate(total=Sum('quantity')).values('total'), output_field=IntegerField()),
+                Value(0)
+            ),
+        )
+
 class Order(models.Model):
     class Meta:
         db_table = "orders"
+        indexes = [
+            models.Index(fields=["status", "subtotal"], name="orders_status_subtotal_idx"),
+            models.Index(fields=["dining_table", "status", "created_at"], name="orders_table_status_idx"),
+        ]
 
     id = models.AutoField(primary_key=True)
     customer_name = models.CharField(max_length=255)
@@ -20,5 +61,31 @@ class Order(models.Model):
     status = models.CharField(max_length=20, choices=OrderStatus.choices, default=OrderStatus.PENDING)
     finished_at = models.DateTimeField(null=True, default=None)
     note = models.TextField(null=True, default=None)
+    subtotal = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal(0))
+    item_count = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
\ No newline at end of file
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = OrderQuerySet.as_manager()
+
+    def get_day(self):
+        """The day whose stock this order's items count against."""
+        return business_day(self.created_at)
+
+    @classmethod
+    def add_to_totals(cls, order_id, subtotal, item_count):
+        """Move the stored totals of an order by the given deltas.
+
+        Callers hold the order row lock (``select_for_update``) for the whole
+        item change, so totals and items commit together.
+        """
+        if subtotal or item_count:
+            cls.objects.filter(pk=order_id).update(
+                subtotal=F('subtotal') + subtotal,
+                item_count=F('item_count') + item_count
+            )
+
+    def get_live_order_items(self):
+        if not hasattr(self, 'live_order_items'):
+            self.live_order_items = list(self.order_items.filter(deleted_at=None).with_prices())
+        return self.live_order_items
@@ -1,19 +1,82 @@
 from django.db import models
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError
-from django.db.models import Sum
+from django.db.models import Case, CharField, DecimalField, ExpressionWrapper, F, IntegerField, Prefetch, Q, Value, When
+from django.db.models.functions import Coalesce
 
-from app_core.models.order import Order
+from app_core.models.order import Order, OrderStatus
 from app_core.models.dish import Dish
-from app_core.models.combo import Combo
+from app_core.models.combo import Combo, combo_price_expression
 
 class OrderItemType(models.TextChoices):
     DISH = "dish"
     COMBO = "combo"
 
+class OrderItemQuerySet(models.QuerySet):
+    def with_prices(self):
+        """Load the dish, or the combo with its SQL-annotated price, alongside each item."""
+        return self.select_related('dish').prefetch_related(
+            Prefetch('combo', queryset=Combo.objects.with_price())
+        )
+
+    def with_unit_price(self):
+        """Annotate ``effective_unit_price``: the captured ``unit_price``, or for items saved
+        before prices were captured, the current dish/combo price. Computed in SQL."""
+        return self.annotate(
+            effective_unit_price=Coalesce(
+                F('unit_price'),
+                Case(
+                    When(type=OrderItemType.DISH, then=F('dish__price')),
+                    default=combo_price_expression('combo_id', 'combo__discount'),
+                ),
+                output_field=DecimalField(max_digits=12, decimal_places=2)
+            )
+        )
+
+    def with_line_total(self):
+        """Annotate ``line_total`` = effective unit price x quantity, in SQL."""
+        return self.with_unit_price().annotate(
+            line_total=ExpressionWrapper(F('effective_unit_price') * F('quantity'), output_field=DecimalField(max_digits=14, decimal_places=2))
+        )
+
+    def kitchen_tickets(self):
+        """Rows of dish portions waiting in the kitchen: every live item of a pending order,
+        with combos expanded into their dishes (item quantity x ``ComboDish.quantity``).
+
+        Both halves are ``UNION ALL``-ed into a single query. Each row has ``kitchen_dish``,
+        ``kitchen_dish_name``, ``portions``, ``table_code``, ``combo_name``, ``note`` and ``ticket_at``.
+        """
+        fields = ("kitchen_dish", "kitchen_dish_name", "portions", "table_code", "combo_name", "note", "ticket_at")
+        waiting = self.filter(deleted_at=None, order__status=OrderStatus.PENDING)
+
+        dish_rows = waiting.filter(type=OrderItemType.DISH).annotate(
+            kitchen_dish=F('dish_id'),
+            kitchen_dish_name=F('dish__name'),
+            portions=F('quantity'),
+            table_code=F('order__dining_table__code'),
+            combo_name=Value(None, output_field=CharField()),
+            ticket_at=F('created_at'),
+        ).values(*fields)
+
+        # The combo_dishes filter comes first so the annotations below reuse its join
+        combo_rows = waiting.filter(type=OrderItemType.COMBO, combo__combo_dishes__deleted_at=None).annotate(
+            kitchen_dish=F('combo__combo_dishes__dish_id'),
+            kitchen_dish_name=F('combo__combo_dishes__dish__name'),
+            portions=ExpressionWrapper(F('quantity') * F('combo__combo_dishes__quantity'), output_field=IntegerField()),
+            table_code=F('order__dining_table__code'),
+            combo_name=F('combo__name'),
+            ticket_at=F('created_at'),
+        ).values(*fields)
+
+        return dish_rows.union(combo_rows, all=True)
+
 class OrderItem(models.Model):
     class Meta:
         db_table = "order_items"
+        indexes = [
+            # Partial (live rows only) where the backend supports it; MySQL builds it over all rows
+            models.Index(fields=["order", "deleted_at"], condition=Q(deleted_at=None), name="order_items_live_order_idx"),
+        ]
 
     id = models.AutoField(primary_key=True)
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="order_items")
@@ -21,11 +84,14 @@ class OrderItem(models.Model):
     dish = models.ForeignKey(Dish, on_delete=models.CASCADE, null=True, default=None, related_name="order_items")
     combo = models.ForeignKey(Combo, on_delete=models.CASCADE, null=True, default=None, related_name="order_items")
     quantity = models.IntegerField(validators=[MinValueValidator(1)])
+    unit_price = models.DecimalField(max_digits=12, decimal_places=2, null=True, default=None)
     note = models.TextField(null=True, default=None)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, default=None)
 
+    objects = OrderItemQuerySet.as_manager()
+
     def clean(self):
         if not self.dish and not self.combo:
             raise ValidationError("Either dish or combo must be set.")
@@ -41,11 +107,23 @@ class OrderItem(models.Model):
 
     def save(self, *args, **kwargs):
         self.clean()
+        if self.unit_price is None:
+            self.capture_unit_price()
         super().save(*args, **kwargs)
 
+    def capture_unit_price(self):
+        """Freeze the current dish/combo price on the item. Call before ``bulk_create``, ``save`` does it itself."""
+        self.unit_price = self.dish.price if self.type == OrderItemType.DISH else self.combo.price
+
+    @property
+    def item_id(self):
+        return self.dish_id if self.type == OrderItemType.DISH else self.combo_id
+
     @property
     def price(self):
+        if self.unit_price is not None:
+            return self.unit_price
         if self.type == OrderItemType.DISH:
             return self.dish.price
         elif self.type == OrderItemType.COMBO:
-            return self.combo.dishes.aggregate(total_price=Sum('price'))['total_price'] - self.combo.discount
\ No newline at end of file
+            return self.combo.price
\ No newline at end of file
@@ -1,14 +1,11 @@
 from rest_framework import serializers
-from datetime import date
-from django.db.models import Sum
 
 from app_core.models.combo import Combo
 from app_core.models.dish import Dish
 from app_core.models.combo_dish import ComboDish
 from app_core.serializers.dish import DishSerializer
-from app_core.models.order_item import OrderItem, OrderItemType
-from app_core.models.order import Order, OrderStatus
-from app_core.models.daily_quantity import DailyQuantity
+from app_core.models.order_item import OrderItemType
+from app_core.helpers.availability import get_availability
 
 class ComboDishSerializer(serializers.ModelSerializer):
     dish = DishSerializer(read_only=True)
@@ -28,46 +25,44 @@ class ComboSerializer(serializers.ModelSerializer):
         return obj.get_image()
 
     def get_dishes(self, obj):
-        return ComboDishSerializer(obj.combo_dishes, many=True).data
+        combo_dishes = getattr(obj, 'live_combo_dishes', None)
+        if combo_dishes is None:
+            combo_dishes = obj.combo_dishes.filter(deleted_at=None).select_related('dish')
+        return ComboDishSerializer(combo_dishes, many=True, context=self.context).data
 
     def get_price(self, obj):
         return obj.price
 
     def get_sold_quantity_today(self, obj):
         """Tính số lượng combo đã bán hôm nay"""
-        today = date.today()
-        sold_quantity = OrderItem.objects.filter(
-            combo=obj,
-            type=OrderItemType.COMBO,
-            deleted_at=None,
-            order__created_at__date=today,
-            order__status__in=[OrderStatus.PENDING, OrderStatus.COMPLETED]
-        ).aggregate(total=Sum('quantity'))['total']
-        return sold_quantity or 0
+        return get_availability(self.context).sold_quantity(OrderItemType.COMBO, obj.id)
 
     def get_remaining_quantity_today(self, obj):
         """Tính số lượng combo còn lại hôm nay"""
-        today = date.today()
-        # Lấy số lượng được set trong DailyQuantity
-        daily_quantity = DailyQuantity.objects.filter(
-            combo=obj,
-            date=today
-        ).first()
-        
-        if not daily_quantity:
-            return None  # Chưa set số lượng cho hôm nay
-        
-        # Tính số lượng đã bán
-        sold_quantity = self.get_sold_quantity_today(obj)
-        
-        # Số lượng còn lại = số lượng set - số lượng đã bán
-        remaining = daily_quantity.quantity - sold_quantity
-        return max(0, remaining)  # Đảm bảo không âm
+        return get_availability(self.context).remaining_quantity(OrderItemType.COMBO, obj.id)
 
     class Meta:
         model = Combo
         fields = "__all__"
 
+class ComboRecordSerializer(serializers.BaseSerializer):
+    """Renders a menu snapshot record like ``ComboSerializer``, adding today's quantities."""
+
+    def to_representation(self, record):
+        availability = get_availability(self.context)
+        data = dict(record.data)
+        data["dishes"] = [
+            {**combo_dish, "dish": {
+                **combo_dish["dish"],
+                "sold_quantity_today": availability.sold_quantity(OrderItemType.DISH, combo_dish["dish"]["id"]),
+                "remaining_quantity_today": availability.remaining_quantity(OrderItemType.DISH, combo_dish["dish"]["id"]),
+            }}
+            for combo_dish in record.data["dishes"]
+        ]
+        data["sold_quantity_today"] = availability.sold_quantity(OrderItemType.COMBO, record.id)
+        data["remaining_quantity_today"] = availability.remaining_quantity(OrderItemType.COMBO, record.id)
+        return data
+
 class CreateComboSerializer(serializers.Serializer):
     name = serializers.CharField(required=True)
     image = serializers.ImageField(required=True)
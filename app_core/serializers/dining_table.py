@@ -7,6 +7,23 @@ class DiningTableSerializer(serializers.ModelSerializer):
         model = DiningTable
         fields = "__all__"
 
+class DiningTableFloorSerializer(serializers.ModelSerializer):
+    status = serializers.CharField(source="floor_status")
+    order_id = serializers.IntegerField(source="current_order_id", allow_null=True)
+    occupied_since = serializers.DateTimeField(allow_null=True)
+    item_count = serializers.IntegerField()
+    subtotal = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+    class Meta:
+        model = DiningTable
+        fields = ["id", "code", "number_of_seats", "status", "order_id", "occupied_since", "item_count", "subtotal"]
+
+class DiningTableRecordSerializer(serializers.BaseSerializer):
+    """Renders a menu snapshot record like ``DiningTableSerializer``."""
+
+    def to_representation(self, record):
+        return record.data
+
 class CreateDiningTableSerializer(serializers.Serializer):
     code = serializers.CharField(required=True)
     number_of_seats = serializers.IntegerField(required=True, min_value=1)
@@ -1,11 +1,8 @@
 from rest_framework import serializers
-from datetime import date
-from django.db.models import Sum
 
 from app_core.models.dish import Dish, DishStatus, DishType
-from app_core.models.order_item import OrderItem, OrderItemType
-from app_core.models.order import Order, OrderStatus
-from app_core.models.daily_quantity import DailyQuantity
+from app_core.models.order_item import OrderItemType
+from app_core.helpers.availability import get_availability
 
 class DishSerializer(serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
@@ -17,39 +14,26 @@ class DishSerializer(serializers.ModelSerializer):
 
     def get_sold_quantity_today(self, obj):
         """Tính số lượng món đã bán hôm nay"""
-        today = date.today()
-        sold_quantity = OrderItem.objects.filter(
-            dish=obj,
-            type=OrderItemType.DISH,
-            deleted_at=None,
-            order__created_at__date=today,
-            order__status__in=[OrderStatus.PENDING, OrderStatus.COMPLETED]
-        ).aggregate(total=Sum('quantity'))['total']
-        return sold_quantity or 0
+        return get_availability(self.context).sold_quantity(OrderItemType.DISH, obj.id)
 
     def get_remaining_quantity_today(self, obj):
         """Tính số lượng món còn lại hôm nay"""
-        today = date.today()
-        # Lấy số lượng được set trong DailyQuantity
-        daily_quantity = DailyQuantity.objects.filter(
-            dish=obj,
-            date=today
-        ).first()
-        
-        if not daily_quantity:
-            return None  # Chưa set số lượng cho hôm nay
-        
-        # Tính số lượng đã bán
-        sold_quantity = self.get_sold_quantity_today(obj)
-        
-        # Số lượng còn lại = số lượng set - số lượng đã bán
-        remaining = daily_quantity.quantity - sold_quantity
-        return max(0, remaining)  # Đảm bảo không âm
+        return get_availability(self.context).remaining_quantity(OrderItemType.DISH, obj.id)
 
     class Meta:
         model = Dish
         fields = "__all__"
 
+class DishRecordSerializer(serializers.BaseSerializer):
+    """Renders a menu snapshot record like ``DishSerializer``, adding today's quantities."""
+
+    def to_representation(self, record):
+        availability = get_availability(self.context)
+        data = dict(record.data)
+        data["sold_quantity_today"] = availability.sold_quantity(OrderItemType.DISH, record.id)
+        data["remaining_quantity_today"] = availability.remaining_quantity(OrderItemType.DISH, record.id)
+        return data
+
 class CreateDishSerializer(serializers.Serializer):
     name = serializers.CharField(required=True)
     image = serializers.ImageField(required=True)
@@ -6,15 +6,78 @@ from app_core.models.dish import Dish, DishStatus
 from app_core.models.combo import Combo
 from app_core.models.user import User
 from app_core.models.user import UserStatus
+from app_core.helpers.menu_snapshot import get_menu_snapshot
+
+class MenuRecordRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field resolved against the in-process menu snapshot instead of ``queryset``.
+
+    ``lookup`` picks the record out of the snapshot and returns None when the
+    pk is not orderable. Pks the snapshot does not know yet (written by another
+    worker less than a second ago) fall back to ``queryset``.
+    """
+
+    def __init__(self, lookup, **kwargs):
+        self.lookup = lookup
+        super().__init__(**kwargs)
+
+    def to_pk(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+    def resolve(self, pks):
+        """Map every orderable pk of ``pks`` to an instance, with at most one query for the snapshot misses."""
+        snapshot = get_menu_snapshot()
+        resolved = {}
+        for pk in pks:
+            record = self.lookup(snapshot, pk)
+            if record is not None:
+                resolved[pk] = record.as_instance()
+
+        missing = set(pks) - set(resolved)
+        if missing:
+            resolved.update({obj.pk: obj for obj in self.get_queryset().filter(pk__in=missing)})
+        return resolved
+
+    def to_internal_value(self, data):
+        pk = self.to_pk(data)
+
+        # Set by CreateOrderItemListSerializer when validating a list of items
+        resolved = getattr(getattr(self.parent, "parent", None), "resolved_references", {}).get(self.field_name)
+        if resolved is None:
+            resolved = self.resolve([pk])
+
+        instance = resolved.get(pk)
+        if instance is None:
+            self.fail('does_not_exist', pk_value=data)
+        return instance
+
+class CreateOrderItemListSerializer(serializers.ListSerializer):
+    """Resolves the dish and combo references of all items up front, so each item
+    is validated against a map instead of looking its references up one by one."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.resolved_references = {}
+            for name, field in self.child.fields.items():
+                if isinstance(field, MenuRecordRelatedField):
+                    pks = set()
+                    for item in data:
+                        try:
+                            pks.add(field.to_pk(item.get(name)))
+                        except (AttributeError, serializers.ValidationError):
+                            continue
+                    self.resolved_references[name] = field.resolve(pks)
+        return super().to_internal_value(data)
 
 class OrderItemSerializer(serializers.ModelSerializer):
     price = serializers.SerializerMethodField()
 
     def get_price(self, obj: OrderItem):
-        if obj.type == OrderItemType.DISH:
-            return obj.dish.price
-        elif obj.type == OrderItemType.COMBO:
-            return obj.combo.price
+        return obj.price
     class Meta:
         model = OrderItem
         fields = "__all__"
@@ -22,8 +85,8 @@ class OrderItemSerializer(serializers.ModelSerializer):
 class OrderSerializer(serializers.ModelSerializer):
     order_items = serializers.SerializerMethodField()
 
-    def get_order_items(self, obj):
-        return OrderItemSerializer(obj.order_items.filter(deleted_at=None), many=True).data
+    def get_order_items(self, obj: Order):
+        return OrderItemSerializer(obj.get_live_order_items(), many=True).data
 
     class Meta:
         model = Order
@@ -32,8 +95,14 @@ class OrderSerializer(serializers.ModelSerializer):
 class CreateOrderItemSerializer(serializers.Serializer):
     order = serializers.PrimaryKeyRelatedField(queryset=Order.objects.filter(status=OrderStatus.PENDING), required=True)
     type = serializers.ChoiceField(choices=OrderItemType.choices, required=True)
-    dish = serializers.PrimaryKeyRelatedField(queryset=Dish.objects.filter(deleted_at=None, status=DishStatus.SELLING), required=False, allow_null=True)
-    combo = serializers.PrimaryKeyRelatedField(queryset=Combo.objects.filter(deleted_at=None), required=False, allow_null=True)
+    dish = MenuRecordRelatedField(
+        lambda snapshot, pk: snapshot.get_selling_dish(pk),
+        queryset=Dish.objects.filter(deleted_at=None, status=DishStatus.SELLING), required=False, allow_null=True
+    )
+    combo = MenuRecordRelatedField(
+        lambda snapshot, pk: snapshot.combos.get(pk),
+        queryset=Combo.objects.filter(deleted_at=None).with_price(), required=False, allow_null=True
+    )
     quantity = serializers.IntegerField(required=True, min_value=1)
     note = serializers.CharField(required=False, allow_blank=True)
 
@@ -47,6 +116,9 @@ class CreateOrderItemSerializer(serializers.Serializer):
         for field in exclude + list(set(existing) - set(fields)):
             self.fields.pop(field, None)
 
+    class Meta:
+        list_serializer_class = CreateOrderItemListSerializer
+
     def validate(self, value):
         if value["type"] == OrderItemType.DISH and not value["dish"]:
             raise serializers.ValidationError("Dish is required")
@@ -58,6 +130,27 @@ class UpdateOrderItemSerializer(serializers.Serializer):
     quantity = serializers.IntegerField(required=False, min_value=1)
     note = serializers.CharField(required=False, allow_blank=True)
 
+class BulkUpdateOrderItemSerializer(UpdateOrderItemSerializer):
+    id = serializers.IntegerField(required=True)
+
+class BulkOrderItemSerializer(serializers.Serializer):
+    order = serializers.PrimaryKeyRelatedField(queryset=Order.objects.filter(status=OrderStatus.PENDING), required=True)
+    add = CreateOrderItemSerializer(many=True, required=False, exclude=["order"])
+    update = BulkUpdateOrderItemSerializer(many=True, required=False)
+    remove = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    def validate(self, value):
+        update_ids = [item["id"] for item in value.get("update", [])]
+        remove_ids = value.get("remove", [])
+
+        if len(set(update_ids)) != len(update_ids) or len(set(remove_ids)) != len(remove_ids):
+            raise serializers.ValidationError("Each item can only appear once in update and remove")
+        if set(update_ids) & set(remove_ids):
+            raise serializers.ValidationError("An item cannot be both updated and removed")
+        if not value.get("add") and not update_ids and not remove_ids:
+            raise serializers.ValidationError("Nothing to change")
+        return value
+
 class CreateOrderSerializer(serializers.Serializer):
     customer_name = serializers.CharField(required=True)
     customer_phone = serializers.CharField(required=True)
@@ -68,4 +161,18 @@ class CreateOrderSerializer(serializers.Serializer):
 class UpdateOrderSerializer(serializers.Serializer):
     customer_name = serializers.CharField(required=False)
     customer_phone = serializers.CharField(required=False)
-    note = serializers.CharField(required=False, allow_blank=True)
\ No newline at end of file
+    note = serializers.CharField(required=False, allow_blank=True)
+
+class KitchenNoteSerializer(serializers.Serializer):
+    table = serializers.CharField()
+    combo = serializers.CharField(allow_null=True)
+    note = serializers.CharField()
+
+class KitchenQueueDishSerializer(serializers.Serializer):
+    dish = serializers.IntegerField()
+    dish_name = serializers.CharField()
+    quantity = serializers.IntegerField()
+    tables = serializers.ListField(child=serializers.CharField())
+    notes = KitchenNoteSerializer(many=True)
+    oldest_ticket_at = serializers.DateTimeField()
+    waiting_seconds = serializers.IntegerField()
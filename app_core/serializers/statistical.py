@@ -0,0 +1,18 @@
+from django.db import models
+from rest_framework import serializers
+
+class ReportType(models.TextChoices):
+    EMPLOYEE_PERFORMANCE = "employee_performance"
+    DISH_AND_COMBO_SOLD = "dish_and_combo_sold"
+
+class CreateReportJobSerializer(serializers.Serializer):
+    report = serializers.ChoiceField(required=True, choices=ReportType.choices)
+    start_date = serializers.DateField(required=True)
+    end_date = serializers.DateField(required=True)
+    employee = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate(self, data):
+        if data['start_date'] > data['end_date']:
+            raise serializers.ValidationError("start_date must be before or equal to end_date.")
+
+        return data
@@ -0,0 +1,60 @@
+from decimal import Decimal
+from django.db import connection
+from django.test import TransactionTestCase
+
+from app_core.helpers.business_day import business_day
+from app_core.helpers.query_plans import check_hot_queries, SUPPORTED_VENDORS
+from app_core.models.bill import Bill
+from app_core.models.daily_quantity import DailyQuantity, DailyQuantityType
+from app_core.models.dining_table import DiningTable
+from app_core.models.dish import Dish
+from app_core.models.order import Order, OrderStatus
+from app_core.models.order_item import OrderItem, OrderItemType
+from app_core.models.user import User, UserRole, UserStatus
+
+class HotQueryPlanTest(TransactionTestCase):
+    """The hot query shapes must be served by the indexes of migration 0002.
+
+    A TransactionTestCase, because dropping an index is DDL, which SQLite refuses
+    inside the test transaction and MySQL would commit anyway.
+    """
+
+    def setUp(self):
+        if connection.vendor not in SUPPORTED_VENDORS:
+            self.skipTest(f"EXPLAIN is not checked on {connection.vendor}")
+
+        # Enough rows that MySQL's planner does not prefer a full scan of an empty table
+        employee = User.objects.create(email="planner@rms.com", fullname="Planner", status=UserStatus.ACTIVATED, role=UserRole.EMPLOYEE)
+        dish = Dish.objects.create(name="Dish", price=Decimal(10), image="dishes/dish.png")
+        tables = DiningTable.objects.bulk_create([DiningTable(code=f"T{i}", number_of_seats=4) for i in range(20)])
+        orders = Order.objects.bulk_create([
+            Order(customer_name="Customer", customer_phone="0", dining_table=tables[i % len(tables)], employee=employee,
+                  status=OrderStatus.COMPLETED if i % 4 else OrderStatus.PENDING)
+            for i in range(200)
+        ])
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, type=OrderItemType.DISH, dish=dish, quantity=1) for order in orders
+        ])
+        Bill.objects.bulk_create([
+            Bill(order=order, total_amount=Decimal(10), created_by=employee) for order in orders
+        ])
+        DailyQuantity.objects.create(date=business_day(), type=DailyQuantityType.DISH, dish=dish, quantity=10)
+        if connection.vendor == "mysql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE TABLE orders, order_items, bills, daily_quantities")
+
+    def __scanned(self):
+        return [label for label, _, uses_index in check_hot_queries() if not uses_index]
+
+    def test_every_hot_query_uses_an_index(self):
+        self.assertEqual(self.__scanned(), [])
+
+    def test_dropping_an_index_is_detected(self):
+        index = next(index for index in Bill._meta.indexes if index.name == "bills_created_at_idx")
+        with connection.schema_editor() as editor:
+            editor.remove_index(Bill, index)
+        try:
+            self.assertIn("bills of a day", self.__scanned())
+        finally:
+            with connection.schema_editor() as editor:
+                editor.add_index(Bill, index)
@@ -12,6 +12,8 @@ from app_core.views.order_item import OrderItemView
 from app_core.views.bill import BillView
 from app_core.views.statistical import StatisticalView
 from app_core.views.daily_quantity import DailyQuantityView
+from app_core.views.events import OrderEventStreamView
+from app_core.views.async_reads import AsyncDishView, AsyncComboView, AsyncOrderView, AsyncDiningTableFloorView, AsyncUserMeView
 
 router = DefaultRouter(trailing_slash=False)
 router.register('users', UserView, basename='user')
@@ -27,5 +29,15 @@ router.register('daily-quantities', DailyQuantityView, basename='daily-quantity'
 
 urlpatterns = [
     path('health/', HealthCheckView.as_view(), name='health-check'),
+    path('events/orders', OrderEventStreamView.as_view(), name='order-events'),
+    # Async variants of the hottest reads, for the ASGI (uvicorn) deployment
+    path('async/dishes', AsyncDishView.as_view(), name='async-dish-list'),
+    path('async/dishes/<str:pk>', AsyncDishView.as_view(), name='async-dish-detail'),
+    path('async/combos', AsyncComboView.as_view(), name='async-combo-list'),
+    path('async/combos/<str:pk>', AsyncComboView.as_view(), name='async-combo-detail'),
+    path('async/orders', AsyncOrderView.as_view(), name='async-order-list'),
+    path('async/orders/<int:pk>', AsyncOrderView.as_view(), name='async-order-detail'),
+    path('async/dining-tables/floor', AsyncDiningTableFloorView.as_view(), name='async-dining-table-floor'),
+    path('async/users/me', AsyncUserMeView.as_view(), name='async-user-me'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -0,0 +1,142 @@
+import logging
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+
+from app_core.models.user import User
+from app_core.models.order import Order
+from app_core.models.order_item import OrderItemType
+from app_core.models.dining_table import DiningTable
+from app_core.serializers.user import UserSerializer
+from app_core.serializers.order import OrderSerializer
+from app_core.serializers.dish import DishRecordSerializer
+from app_core.serializers.combo import ComboRecordSerializer
+from app_core.serializers.dining_table import DiningTableFloorSerializer
+from app_core.helpers.response import RestResponse
+from app_core.helpers.availability import DailyAvailability
+from app_core.helpers.menu_snapshot import aget_menu_snapshot
+from app_core.helpers.paginator import apaginate_and_serialize, paginate_and_serialize
+from app_core.middlewares.authentication import aauthenticate_token
+from app_core.views.combo import filter_combo_records
+from app_core.views.order import filter_orders
+from app_core.errors.exceptions import InvalidCursorException, InvalidDateFilterException, InvalidPriceFilterException
+
+class AsyncAPIView(View):
+    """Base of the async read endpoints served under ASGI (uvicorn).
+
+    DRF viewsets are sync only, so these are plain Django views. They
+    authenticate like ``UserAuthentication``, with the session read through the
+    async Redis client, and answer with the ``RestResponse`` envelope. Handlers
+    read through the async ORM and must not trigger lazy queries while serializing.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        bearer_token = request.headers.get("Authorization", None)
+        if bearer_token is None:
+            return RestResponse(status=status.HTTP_401_UNAUTHORIZED, message="Missing token!").json_response
+
+        try:
+            request.user = await aauthenticate_token(bearer_token.replace("Bearer ", ""))
+        except AuthenticationFailed as e:
+            return RestResponse(status=status.HTTP_401_UNAUTHORIZED, message=str(e.detail)).json_response
+
+        request.query_params = request.GET
+        return await super().dispatch(request, *args, **kwargs)
+
+async def _menu_availability(records, item_type) -> DailyAvailability:
+    keys = [(item_type, record.id) for record in records]
+    if item_type == OrderItemType.COMBO:
+        keys += [(OrderItemType.DISH, dish_id) for record in records for dish_id, _ in record.dishes]
+    return await DailyAvailability().aload(keys)
+
+class AsyncDishView(AsyncAPIView):
+    async def get(self, request, pk=None):
+        try:
+            logging.getLogger().info("AsyncDishView.get pk=%s, req=%s", pk, request.query_params)
+            dishes = (await aget_menu_snapshot()).dishes
+
+            if pk is None:
+                records = list(dishes.values())
+                context = {"availability": await _menu_availability(records, OrderItemType.DISH)}
+                data = paginate_and_serialize(request, records, DishRecordSerializer, context=context)
+                return RestResponse(status=status.HTTP_200_OK, data=data).json_response
+
+            record = dishes.get(int(pk))
+            if record is None:
+                raise ValueError(pk)
+            context = {"availability": await _menu_availability([record], OrderItemType.DISH)}
+            return RestResponse(status=status.HTTP_200_OK, data=DishRecordSerializer(record, context=context).data).json_response
+        except ValueError:
+            return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy món ăn!").json_response
+        except Exception as e:
+            logging.getLogger().exception("AsyncDishView.get exc=%s, pk=%s", e, pk)
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).json_response
+
+class AsyncComboView(AsyncAPIView):
+    async def get(self, request, pk=None):
+        try:
+            logging.getLogger().info("AsyncComboView.get pk=%s, req=%s", pk, request.query_params)
+            combos = (await aget_menu_snapshot()).combos
+
+            if pk is None:
+                records = filter_combo_records(combos.values(), request.query_params)
+                context = {"availability": await _menu_availability(records, OrderItemType.COMBO)}
+                data = paginate_and_serialize(request, records, ComboRecordSerializer, context=context)
+                return RestResponse(status=status.HTTP_200_OK, data=data).json_response
+
+            record = combos.get(int(pk))
+            if record is None:
+                raise ValueError(pk)
+            context = {"availability": await _menu_availability([record], OrderItemType.COMBO)}
+            return RestResponse(status=status.HTTP_200_OK, data=ComboRecordSerializer(record, context=context).data).json_response
+        except InvalidPriceFilterException:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Giá lọc phải là số!").json_response
+        except ValueError:
+            return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy combo!").json_response
+        except Exception as e:
+            logging.getLogger().exception("AsyncComboView.get exc=%s, pk=%s", e, pk)
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).json_response
+
+class AsyncOrderView(AsyncAPIView):
+    async def get(self, request, pk=None):
+        try:
+            logging.getLogger().info("AsyncOrderView.get pk=%s, req=%s", pk, request.query_params)
+
+            if pk is None:
+                queryset = filter_orders(Order.objects.for_read(), request.query_params)
+                data = await apaginate_and_serialize(request, queryset, OrderSerializer, allow_cursor=True)
+                return RestResponse(status=status.HTTP_200_OK, data=data).json_response
+
+            order = await Order.objects.for_read().aget(pk=pk)
+            return RestResponse(status=status.HTTP_200_OK, data=OrderSerializer(order).data).json_response
+        except InvalidCursorException:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Cursor không hợp lệ!").json_response
+        except InvalidDateFilterException:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Ngày phải là định dạng yyyy-mm-dd!").json_response
+        except Order.DoesNotExist:
+            return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy đơn đặt bàn!").json_response
+        except Exception as e:
+            logging.getLogger().exception("AsyncOrderView.get exc=%s, pk=%s", e, pk)
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).json_response
+
+class AsyncDiningTableFloorView(AsyncAPIView):
+    async def get(self, request):
+        try:
+            logging.getLogger().info("AsyncDiningTableFloorView.get req=%s", request.query_params)
+            tables = [table async for table in DiningTable.objects.filter(deleted_at=None).with_floor_status().order_by("id")]
+            return RestResponse(status=status.HTTP_200_OK, data=DiningTableFloorSerializer(tables, many=True).data).json_response
+        except Exception as e:
+            logging.getLogger().exception("AsyncDiningTableFloorView.get exc=%s", e)
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).json_response
+
+class AsyncUserMeView(AsyncAPIView):
+    async def get(self, request):
+        try:
+            logging.getLogger().info("AsyncUserMeView.get")
+            user = await User.objects.aget(pk=request.user.id)
+            return RestResponse(status=status.HTTP_200_OK, data=UserSerializer(user).data).json_response
+        except User.DoesNotExist:
+            return RestResponse(status=status.HTTP_404_NOT_FOUND).json_response
+        except Exception as e:
+            logging.getLogger().exception("AsyncUserMeView.get exc=%s", e)
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR).json_response
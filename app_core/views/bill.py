@@ -1,20 +1,55 @@
 import logging
+from decimal import Decimal
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from django.db import transaction
+from django.db.models import Sum
 
 from app_core.models.order import Order, OrderStatus
 from app_core.models.bill import Bill
+from app_core.models.daily_revenue import DailyRevenue
+from app_core.models.daily_item_sales import DailyItemSales
 from app_core.serializers.bill import BillSerializer, CreateBillSerializer
 from app_core.helpers.response import RestResponse
+from app_core.helpers.idempotency import idempotent, IDEMPOTENCY_KEY_PARAMETER
+from app_core.helpers.events import OrderEvent, publish_order_event
+from app_core.helpers.segment_cache import invalidate_day_segment, EMPLOYEE_PERFORMANCE_SEGMENT
+from app_core.helpers.business_day import business_day, window_filter, parse_filter_date
+from app_core.helpers.export import export_response, EXPORT_FORMATS, EXPORT_FORMAT_PARAMETER
 from app_core.middlewares.authentication import UserAuthentication
-from app_core.helpers.paginator import CustomPageNumberPagination
+from app_core.middlewares.permissions import IsManager
+from app_core.helpers.paginator import paginate_and_serialize
+from app_core.errors.exceptions import InvalidCursorException, InvalidDateFilterException
+
+def filter_bills(queryset, query_params):
+    """Apply the bill list's filter params to ``queryset``.
+
+    Raises ``InvalidDateFilterException`` when ``created_at`` is not yyyy-mm-dd.
+    """
+    order = query_params.get("order", None)
+    if order:
+        queryset = queryset.filter(order=order)
+
+    created_at = query_params.get("created_at", None)
+    if created_at:
+        queryset = queryset.filter(**window_filter("created_at", parse_filter_date(created_at)))
+
+    created_by = query_params.get("created_by", None)
+    if created_by:
+        queryset = queryset.filter(created_by=created_by)
+
+    return queryset
 
 class BillView(viewsets.ViewSet):
     authentication_classes = (UserAuthentication, )
 
+    def get_permissions(self):
+        if self.action in ['export']:
+            return [IsManager()]
+        return []
+
     def retrieve(self, request, pk=None):
         try:
             logging.getLogger().info("BillView.retrieve pk=%s", pk)
@@ -30,6 +65,7 @@ class BillView(viewsets.ViewSet):
     @swagger_auto_schema(manual_parameters=[
         openapi.Parameter(name="page", in_="query", type=openapi.TYPE_INTEGER, required=False),
         openapi.Parameter(name="size", in_="query", type=openapi.TYPE_INTEGER, required=False),
+        openapi.Parameter(name="cursor", in_="query", type=openapi.TYPE_STRING, required=False, description="Keyset mode, send empty for the first page"),
         openapi.Parameter(name="order", in_="query", type=openapi.TYPE_INTEGER, required=False),
         openapi.Parameter(name="created_at", in_="query", type=openapi.TYPE_STRING, required=False),
         openapi.Parameter(name="created_by", in_="query", type=openapi.TYPE_INTEGER, required=False),
@@ -37,30 +73,47 @@ class BillView(viewsets.ViewSet):
     def list(self, request):
         try:
             logging.getLogger().info("BillView.list req=%s", request.query_params)
-            queryset = Bill.objects.all()
-
-            order = request.query_params.get("order", None)
-            if order:
-                queryset = queryset.filter(order=order)
-
-            created_at = request.query_params.get("created_at", None)
-            if created_at:
-                queryset = queryset.filter(created_at__date=created_at)
-
-            created_by = request.query_params.get("created_by", None)
-            if created_by:
-                queryset = queryset.filter(created_by=created_by)
-
-            serializer = BillSerializer(queryset, many=True)
-            paginator = CustomPageNumberPagination()
-            queryset = paginator.paginate_queryset(queryset, request)
-            return RestResponse(status=status.HTTP_200_OK, data=paginator.get_paginated_data(serializer.data)).response
+            queryset = filter_bills(Bill.objects.all(), request.query_params)
+            data = paginate_and_serialize(request, queryset, BillSerializer, allow_cursor=True)
+            return RestResponse(status=status.HTTP_200_OK, data=data).response
+        except InvalidCursorException:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Cursor không hợp lệ!").response
+        except InvalidDateFilterException:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Ngày phải là định dạng yyyy-mm-dd!").response
         except Exception as e:
             logging.getLogger().exception("BillView.list exc=%s, req=%s", e, request.query_params)
             return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
 
+    @action(detail=False, methods=['GET'], url_path='export')
+    @swagger_auto_schema(manual_parameters=[
+        EXPORT_FORMAT_PARAMETER,
+        openapi.Parameter(name="order", in_="query", type=openapi.TYPE_INTEGER, required=False),
+        openapi.Parameter(name="created_at", in_="query", type=openapi.TYPE_STRING, required=False),
+        openapi.Parameter(name="created_by", in_="query", type=openapi.TYPE_INTEGER, required=False),
+    ])
+    def export(self, request):
+        try:
+            logging.getLogger().info("BillView.export req=%s", request.query_params)
+            export_format = request.query_params.get("file_format", "csv")
+            if export_format not in EXPORT_FORMATS:
+                return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Định dạng tệp phải là csv hoặc xlsx!").response
+
+            queryset = filter_bills(Bill.objects.all(), request.query_params)
+            return export_response(
+                export_format, "bills",
+                ["id", "order", "customer_name", "dining_table", "total_amount", "created_by", "created_at"],
+                queryset,
+                ["id", "order_id", "order__customer_name", "order__dining_table__code", "total_amount", "created_by__fullname", "created_at"],
+            )
+        except InvalidDateFilterException:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Ngày phải là định dạng yyyy-mm-dd!").response
+        except Exception as e:
+            logging.getLogger().exception("BillView.export exc=%s, req=%s", e, request.query_params)
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
+
 
-    @swagger_auto_schema(request_body=CreateBillSerializer)
+    @swagger_auto_schema(request_body=CreateBillSerializer, manual_parameters=[IDEMPOTENCY_KEY_PARAMETER])
+    @idempotent
     def create(self, request):
         try:
             logging.getLogger().info("BillView.create req=%s", request.data)
@@ -69,23 +122,37 @@ class BillView(viewsets.ViewSet):
             if not serializer.is_valid():
                 return RestResponse(status=status.HTTP_400_BAD_REQUEST, data=serializer.errors, message="Vui lòng kiểm tra lại dữ liệu!").response
 
-            order = serializer.validated_data['order']
+            with transaction.atomic():
+                # Locking the order makes the status checks, the total and the completion one step,
+                # so concurrent requests cannot bill the same order twice.
+                order = Order.objects.select_for_update().get(pk=serializer.validated_data['order'].pk)
 
-            if order.status == OrderStatus.COMPLETED:
-                return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Đơn đặt bàn đã được xử lý trước đó!").response
+                if order.status == OrderStatus.COMPLETED:
+                    return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Đơn đặt bàn đã được xử lý trước đó!").response
 
-            if order.status == OrderStatus.CANCELLED:
-                return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Đơn đặt bàn đã bị hủy!").response
+                if order.status == OrderStatus.CANCELLED:
+                    return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Đơn đặt bàn đã bị hủy!").response
 
-            if order.employee != request.user:
-                return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Bạn không có quyền tạo hóa đơn cho đơn đặt bàn này!").response
+                if order.employee_id != request.user.id:
+                    return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Bạn không có quyền tạo hóa đơn cho đơn đặt bàn này!").response
+
+                live_items = order.order_items.filter(deleted_at=None)
+                total_amount = live_items.with_line_total().aggregate(total=Sum('line_total'))['total'] or Decimal(0)
 
-            total_amount = sum(item.price * item.quantity for item in order.order_items.all())
-            
-            with transaction.atomic():
                 bill = Bill.objects.create(order=order, total_amount=total_amount, created_by=request.user)
+                bill_date = business_day(bill.created_at)
+                DailyRevenue.add_bill(bill_date, total_amount)
+                DailyItemSales.add_order_items(bill_date, live_items.only('type', 'dish_id', 'combo_id', 'quantity'))
                 order.status = OrderStatus.COMPLETED
                 order.save()
+                publish_order_event(OrderEvent.BILL_CREATED, {
+                    "bill": bill.id,
+                    "order": order.id,
+                    "dining_table": order.dining_table_id,
+                    "total_amount": total_amount,
+                })
+
+            invalidate_day_segment(EMPLOYEE_PERFORMANCE_SEGMENT, bill_date)
 
             return RestResponse(status=status.HTTP_200_OK, data=BillSerializer(bill).data).response
         except Exception as e:
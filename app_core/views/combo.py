@@ -1,4 +1,5 @@
 import logging
+from decimal import Decimal, InvalidOperation
 from rest_framework import viewsets, status
 from datetime import datetime
 from drf_yasg import openapi
@@ -11,15 +12,55 @@ from app_core.models.combo import Combo
 from app_core.models.combo_dish import ComboDish
 from app_core.serializers.combo import (
     ComboSerializer,
+    ComboRecordSerializer,
     CreateComboSerializer,
     UpdateComboSerializer,
     AddDishToComboSerializer,
     UpdateDishQuantityInComboSerializer
 )
 from app_core.helpers.response import RestResponse
-from app_core.helpers.paginator import CustomPageNumberPagination
+from app_core.helpers.paginator import paginate_and_serialize
+from app_core.helpers.menu_snapshot import get_menu_snapshot, bump_menu_version
+from app_core.helpers.availability import get_menu_availability_version
+from app_core.helpers.single_flight import coalesced
 from app_core.middlewares.authentication import UserAuthentication
 from app_core.middlewares.permissions import IsManager, IsEmployee
+from app_core.errors.exceptions import InvalidPriceFilterException
+
+def _parse_price(value: str) -> Decimal:
+    try:
+        price = Decimal(value)
+    except InvalidOperation:
+        raise InvalidPriceFilterException(value)
+    # NaN can't be compared with a price, and infinities are no use as bounds
+    if not price.is_finite():
+        raise InvalidPriceFilterException(value)
+    return price
+
+def filter_combo_records(records, query_params):
+    """Apply the combo list's ``min_price``/``max_price``/``ordering`` params to snapshot records.
+
+    Raises ``InvalidPriceFilterException`` when a price param is not a number.
+    """
+    records = list(records)
+
+    min_price = query_params.get("min_price", None)
+    if min_price:
+        min_price = _parse_price(min_price)
+        records = [record for record in records if record.price >= min_price]
+
+    max_price = query_params.get("max_price", None)
+    if max_price:
+        max_price = _parse_price(max_price)
+        records = [record for record in records if record.price <= max_price]
+
+    ordering = query_params.get("ordering", None)
+    if ordering == "price":
+        records.sort(key=lambda record: (record.price, record.id))
+    elif ordering == "-price":
+        records.sort(key=lambda record: (-record.price, record.id))
+
+    return records
 
 class ComboView(viewsets.ViewSet):
     parser_classes = (MultiPartParser,)
@@ -33,15 +74,19 @@ class ComboView(viewsets.ViewSet):
     @swagger_auto_schema(responses={200: ComboSerializer(many=True)}, manual_parameters=[
         openapi.Parameter(name="page", in_="query", type=openapi.TYPE_INTEGER, required=False),
         openapi.Parameter(name="size", in_="query", type=openapi.TYPE_INTEGER, required=False),
+        openapi.Parameter(name="min_price", in_="query", type=openapi.TYPE_NUMBER, required=False),
+        openapi.Parameter(name="max_price", in_="query", type=openapi.TYPE_NUMBER, required=False),
+        openapi.Parameter(name="ordering", in_="query", type=openapi.TYPE_STRING, required=False, enum=["price", "-price"]),
     ])
+    @coalesced(fresh_for=5, stale_for=60, version=get_menu_availability_version)
     def list(self, request):
         try:
             logging.getLogger().info("ComboView.list req=%s", request.query_params)
-            queryset = Combo.objects.filter(deleted_at=None)
-            serializer = ComboSerializer(queryset, many=True)
-            paginator = CustomPageNumberPagination()
-            queryset = paginator.paginate_queryset(queryset, request)
-            return RestResponse(status=status.HTTP_200_OK, data=paginator.get_paginated_data(serializer.data)).response
+            records = filter_combo_records(get_menu_snapshot().combos.values(), request.query_params)
+            data = paginate_and_serialize(request, records, ComboRecordSerializer)
+            return RestResponse(status=status.HTTP_200_OK, data=data).response
+        except InvalidPriceFilterException:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Giá lọc phải là số!").response
         except Exception as e:
             logging.getLogger().exception("ComboView.list exc=%s, req=%s", e, request.query_params)
             return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
@@ -50,10 +95,12 @@ class ComboView(viewsets.ViewSet):
     def retrieve(self, request, pk=None):
         try:
             logging.getLogger().info("ComboView.retrieve pk=%s", pk)
-            queryset = Combo.objects.get(pk=pk, deleted_at=None)
-            serializer = ComboSerializer(queryset)
+            record = get_menu_snapshot().combos.get(int(pk))
+            if record is None:
+                raise Combo.DoesNotExist()
+            serializer = ComboRecordSerializer(record)
             return RestResponse(status=status.HTTP_200_OK, data=serializer.data).response
-        except Combo.DoesNotExist:
+        except (Combo.DoesNotExist, ValueError):
             return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy combo!").response
         except Exception as e:
             logging.getLogger().exception("ComboView.retrieve exc=%s, pk=%s", e, pk)
@@ -70,6 +117,7 @@ class ComboView(viewsets.ViewSet):
 
             obj = Combo(**serializer.validated_data)
             obj.save()
+            bump_menu_version()
             return RestResponse(status=status.HTTP_200_OK, data=ComboSerializer(obj).data).response
         except Exception as e:
             logging.getLogger().exception("ComboView.create exc=%s, req=%s", e, request.data)
@@ -87,6 +135,7 @@ class ComboView(viewsets.ViewSet):
             for key, value in serializer.validated_data.items():
                 setattr(obj, key, value)
             obj.save()
+            bump_menu_version()
             return RestResponse(status=status.HTTP_200_OK, data=ComboSerializer(obj).data).response
         except Combo.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy combo!").response
@@ -100,6 +149,7 @@ class ComboView(viewsets.ViewSet):
             obj = Combo.objects.get(pk=pk, deleted_at=None)
             obj.deleted_at = datetime.now()
             obj.save()
+            bump_menu_version()
             return RestResponse(status=status.HTTP_200_OK, data=ComboSerializer(obj).data).response
         except Combo.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy combo!").response
@@ -126,6 +176,7 @@ class ComboView(viewsets.ViewSet):
                 dish=serializer.validated_data['dish'],
                 quantity=serializer.validated_data['quantity']
             )
+            bump_menu_version()
             return RestResponse(status=status.HTTP_200_OK, data=ComboSerializer(obj).data).response
         except Combo.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy combo!").response
@@ -148,6 +199,7 @@ class ComboView(viewsets.ViewSet):
                 return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Món ăn không tồn tại trong combo!").response
 
             obj.combo_dishes.filter(dish=pk_dish, deleted_at=None).update(quantity=serializer.validated_data['quantity'])
+            bump_menu_version()
             return RestResponse(status=status.HTTP_200_OK, data=ComboSerializer(obj).data).response
         except Combo.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy combo!").response
@@ -162,6 +214,7 @@ class ComboView(viewsets.ViewSet):
             combo : Combo = Combo.objects.get(pk=pk, deleted_at=None)
             dish : Dish = Dish.objects.get(pk=pk_dish, deleted_at=None)
             combo.combo_dishes.filter(dish=dish, deleted_at=None).delete()
+            bump_menu_version()
             return RestResponse(status=status.HTTP_200_OK, data=ComboSerializer(combo).data).response
         except Dish.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy món ăn!").response
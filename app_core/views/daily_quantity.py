@@ -1,5 +1,6 @@
 import logging
 from datetime import date
+from django.db import transaction
 from rest_framework import viewsets, status
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
@@ -11,7 +12,7 @@ from app_core.serializers.daily_quantity import (
     CreateDailyQuantitySerializer
 )
 from app_core.helpers.response import RestResponse
-from app_core.helpers.paginator import CustomPageNumberPagination
+from app_core.helpers.paginator import paginate_and_serialize
 from app_core.middlewares.authentication import UserAuthentication
 from app_core.middlewares.permissions import IsManager
 
@@ -61,11 +62,9 @@ class DailyQuantityView(viewsets.ViewSet):
             if combo_id:
                 queryset = queryset.filter(combo_id=combo_id)
 
-            serializer = DailyQuantitySerializer(queryset, many=True)
-            paginator = CustomPageNumberPagination()
-            queryset = paginator.paginate_queryset(queryset, request)
+            data = paginate_and_serialize(request, queryset, DailyQuantitySerializer)
 
-            return RestResponse(status=status.HTTP_200_OK, data=paginator.get_paginated_data(serializer.data)).response
+            return RestResponse(status=status.HTTP_200_OK, data=data).response
         except Exception as e:
             logging.getLogger().exception("DailyQuantityView.list exc=%s, req=%s", e, request.query_params)
             return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
@@ -89,33 +88,39 @@ class DailyQuantityView(viewsets.ViewSet):
             combo = serializer.validated_data.get('combo')
             quantity = serializer.validated_data['quantity']
 
-            # Try to get existing record
-            if dish:
-                obj, created = DailyQuantity.objects.get_or_create(
-                    date=date_value,
-                    dish=dish,
-                    defaults={
-                        'type': serializer.validated_data['type'],
-                        'quantity': quantity
-                    }
-                )
-                if not created:
-                    # Update existing record
-                    obj.quantity = quantity
-                    obj.save()
-            elif combo:
-                obj, created = DailyQuantity.objects.get_or_create(
-                    date=date_value,
-                    combo=combo,
-                    defaults={
-                        'type': serializer.validated_data['type'],
-                        'quantity': quantity
-                    }
-                )
-                if not created:
-                    # Update existing record
-                    obj.quantity = quantity
-                    obj.save()
+            # The new plan stays locked until its sold counter is set, so a reservation can't land in between
+            with transaction.atomic():
+                # Try to get existing record
+                if dish:
+                    obj, created = DailyQuantity.objects.get_or_create(
+                        date=date_value,
+                        dish=dish,
+                        defaults={
+                            'type': serializer.validated_data['type'],
+                            'quantity': quantity
+                        }
+                    )
+                    if created:
+                        obj = DailyQuantity.recount_sold(date_value, DailyQuantity.objects.select_for_update().filter(pk=obj.pk))[0]
+                    else:
+                        # Update existing record; sold is left to the conditional updates of reserve/release
+                        obj.quantity = quantity
+                        obj.save(update_fields=["quantity", "updated_at"])
+                elif combo:
+                    obj, created = DailyQuantity.objects.get_or_create(
+                        date=date_value,
+                        combo=combo,
+                        defaults={
+                            'type': serializer.validated_data['type'],
+                            'quantity': quantity
+                        }
+                    )
+                    if created:
+                        obj = DailyQuantity.recount_sold(date_value, DailyQuantity.objects.select_for_update().filter(pk=obj.pk))[0]
+                    else:
+                        # Update existing record; sold is left to the conditional updates of reserve/release
+                        obj.quantity = quantity
+                        obj.save(update_fields=["quantity", "updated_at"])
 
             return RestResponse(status=status.HTTP_200_OK, data=DailyQuantitySerializer(obj).data).response
         except Exception as e:
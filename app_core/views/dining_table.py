@@ -3,11 +3,13 @@ from datetime import datetime
 from rest_framework import viewsets, status
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
+from rest_framework.decorators import action
 
 from app_core.models.dining_table import DiningTable
-from app_core.serializers.dining_table import DiningTableSerializer, CreateDiningTableSerializer, UpdateDiningTableSerializer
+from app_core.serializers.dining_table import DiningTableSerializer, DiningTableFloorSerializer, DiningTableRecordSerializer, CreateDiningTableSerializer, UpdateDiningTableSerializer
 from app_core.helpers.response import RestResponse
-from app_core.helpers.paginator import CustomPageNumberPagination
+from app_core.helpers.paginator import paginate_and_serialize
+from app_core.helpers.menu_snapshot import get_menu_snapshot, bump_menu_version
 from app_core.middlewares.authentication import UserAuthentication
 from app_core.middlewares.permissions import IsManager, IsEmployee
 
@@ -26,23 +28,35 @@ class DiningTableView(viewsets.ViewSet):
     def list(self, request):
         try:
             logging.getLogger().info("DiningTableView.list req=%s", request.query_params)
-            queryset = DiningTable.objects.filter(deleted_at=None)
-            serializer = DiningTableSerializer(queryset, many=True)
-            paginator = CustomPageNumberPagination()
-            queryset = paginator.paginate_queryset(queryset, request)
-            return RestResponse(status=status.HTTP_200_OK, data=paginator.get_paginated_data(serializer.data)).response
+            records = list(get_menu_snapshot().dining_tables.values())
+            data = paginate_and_serialize(request, records, DiningTableRecordSerializer)
+            return RestResponse(status=status.HTTP_200_OK, data=data).response
         except Exception as e:
             logging.getLogger().exception("DiningTableView.list exc=%s, req=%s", e, request.query_params)
             return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
 
+    @action(detail=False, methods=['GET'], url_path='floor')
+    @swagger_auto_schema(responses={200: DiningTableFloorSerializer(many=True)})
+    def floor(self, request):
+        try:
+            logging.getLogger().info("DiningTableView.floor req=%s", request.query_params)
+            queryset = DiningTable.objects.filter(deleted_at=None).with_floor_status().order_by("id")
+            serializer = DiningTableFloorSerializer(queryset, many=True)
+            return RestResponse(status=status.HTTP_200_OK, data=serializer.data).response
+        except Exception as e:
+            logging.getLogger().exception("DiningTableView.floor exc=%s, req=%s", e, request.query_params)
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
+
     @swagger_auto_schema(responses={200: DiningTableSerializer})
     def retrieve(self, request, pk=None):
         try:
             logging.getLogger().info("DiningTableView.retrieve pk=%s", pk)
-            queryset = DiningTable.objects.get(pk=pk, deleted_at=None)
-            serializer = DiningTableSerializer(queryset)
+            record = get_menu_snapshot().dining_tables.get(int(pk))
+            if record is None:
+                raise DiningTable.DoesNotExist()
+            serializer = DiningTableRecordSerializer(record)
             return RestResponse(status=status.HTTP_200_OK, data=serializer.data).response
-        except DiningTable.DoesNotExist:
+        except (DiningTable.DoesNotExist, ValueError):
             return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy bàn ăn!").response
         except Exception as e:
             logging.getLogger().exception("DiningTableView.retrieve exc=%s, pk=%s", e, pk)
@@ -62,6 +76,7 @@ class DiningTableView(viewsets.ViewSet):
 
             obj = DiningTable(**serializer.validated_data)
             obj.save()
+            bump_menu_version()
             return RestResponse(status=status.HTTP_200_OK, data=DiningTableSerializer(obj).data).response
         except Exception as e:
             logging.getLogger().exception("DiningTableView.create exc=%s, req=%s", e, request.data)
@@ -80,6 +95,7 @@ class DiningTableView(viewsets.ViewSet):
             for key, value in serializer.validated_data.items():
                 setattr(obj, key, value)
             obj.save()
+            bump_menu_version()
             return RestResponse(status=status.HTTP_200_OK, data=DiningTableSerializer(obj).data).response
         except DiningTable.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy bàn ăn!").response
@@ -93,6 +109,7 @@ class DiningTableView(viewsets.ViewSet):
             obj = DiningTable.objects.get(pk=pk, deleted_at=None)
             obj.deleted_at = datetime.now()
             obj.save()
+            bump_menu_version()
             return RestResponse(status=status.HTTP_200_OK, data=DiningTableSerializer(obj).data).response
         except DiningTable.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy bàn ăn!").response
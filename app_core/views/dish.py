@@ -6,9 +6,12 @@ from drf_yasg.utils import swagger_auto_schema
 from rest_framework.parsers import MultiPartParser
 
 from app_core.models.dish import Dish
-from app_core.serializers.dish import DishSerializer, CreateDishSerializer, UpdateDishSerializer
+from app_core.serializers.dish import DishSerializer, DishRecordSerializer, CreateDishSerializer, UpdateDishSerializer
 from app_core.helpers.response import RestResponse
-from app_core.helpers.paginator import CustomPageNumberPagination
+from app_core.helpers.paginator import paginate_and_serialize
+from app_core.helpers.menu_snapshot import get_menu_snapshot, bump_menu_version
+from app_core.helpers.availability import get_menu_availability_version
+from app_core.helpers.single_flight import coalesced
 from app_core.middlewares.authentication import UserAuthentication
 from app_core.middlewares.permissions import IsManager, IsEmployee
 
@@ -28,15 +31,14 @@ class DishView(viewsets.ViewSet):
             openapi.Parameter(name="size", in_="query", type=openapi.TYPE_INTEGER, required=False),
         ]
     )
+    @coalesced(fresh_for=5, stale_for=60, version=get_menu_availability_version)
     def list(self, request):
         try:
             logging.getLogger().info("DishView.list req=%s", request.query_params)
-            queryset = Dish.objects.filter(deleted_at=None)
-            serializer = DishSerializer(queryset, many=True)
-            paginator = CustomPageNumberPagination()
-            queryset = paginator.paginate_queryset(queryset, request)
+            records = list(get_menu_snapshot().dishes.values())
+            data = paginate_and_serialize(request, records, DishRecordSerializer)
 
-            return RestResponse(status=status.HTTP_200_OK, data=paginator.get_paginated_data(serializer.data)).response
+            return RestResponse(status=status.HTTP_200_OK, data=data).response
         except Exception as e:
             return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
 
@@ -44,10 +46,12 @@ class DishView(viewsets.ViewSet):
     def retrieve(self, request, pk=None):
         try:
             logging.getLogger().info("DishView.retrieve pk=%s", pk)
-            queryset = Dish.objects.get(pk=pk, deleted_at=None)
-            serializer = DishSerializer(queryset)
+            record = get_menu_snapshot().dishes.get(int(pk))
+            if record is None:
+                raise Dish.DoesNotExist()
+            serializer = DishRecordSerializer(record)
             return RestResponse(status=status.HTTP_200_OK, data=serializer.data).response
-        except Dish.DoesNotExist:
+        except (Dish.DoesNotExist, ValueError):
             return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy món ăn!").response
         except Exception as e:
             logging.getLogger().exception("DishView.retrieve exc=%s, pk=%s", e, pk)
@@ -64,6 +68,7 @@ class DishView(viewsets.ViewSet):
 
             obj = Dish(**serializer.validated_data)
             obj.save()
+            bump_menu_version()
 
             return RestResponse(status=status.HTTP_200_OK, data=DishSerializer(obj).data).response
         except Exception as e:
@@ -83,6 +88,7 @@ class DishView(viewsets.ViewSet):
             for key, value in serializer.validated_data.items():
                 setattr(obj, key, value)
             obj.save()
+            bump_menu_version()
             return RestResponse(status=status.HTTP_200_OK, data=DishSerializer(obj).data).response
         except Dish.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy món ăn!").response
@@ -96,6 +102,7 @@ class DishView(viewsets.ViewSet):
             obj = Dish.objects.get(pk=pk, deleted_at=None)
             obj.deleted_at = datetime.now()
             obj.save()
+            bump_menu_version()
             return RestResponse(status=status.HTTP_200_OK, data=DishSerializer(obj).data).response
         except Dish.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy món ăn!").response
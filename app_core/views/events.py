@@ -0,0 +1,84 @@
+import asyncio
+import logging
+from django.http import StreamingHttpResponse
+from django.views import View
+from redis.exceptions import ResponseError
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+
+from app_core.helpers.events import order_event_hub, read_events_after, parse_event_id
+from app_core.helpers.response import RestResponse
+from app_core.middlewares.authentication import aauthenticate_token
+
+HEARTBEAT_SECONDS = 15
+RETRY_MILLISECONDS = 3000
+
+class OrderEventStreamView(View):
+    """Server-Sent Events stream of order, item and bill events. Needs the ASGI server.
+
+    ``EventSource`` cannot send headers, so the access token may also be given
+    as ``?token=``. ``?types=`` takes a comma separated list of event types to
+    keep. Reconnecting clients send ``Last-Event-ID`` and first receive the
+    events they missed.
+    """
+
+    async def get(self, request):
+        bearer_token = request.headers.get("Authorization", "")
+        token = bearer_token.replace("Bearer ", "") or request.GET.get("token", "")
+
+        try:
+            if not token:
+                raise AuthenticationFailed("Missing token!")
+            await aauthenticate_token(token)
+        except AuthenticationFailed as e:
+            return RestResponse(status=status.HTTP_401_UNAUTHORIZED, message=str(e.detail)).json_response
+
+        last_event_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+        types = set(filter(None, request.GET.get("types", "").split(",")))
+        logging.getLogger().info("OrderEventStreamView.get last_event_id=%s, types=%s", last_event_id, types)
+
+        response = StreamingHttpResponse(self.__stream(last_event_id, types), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def __stream(self, last_event_id, types):
+        queue = await order_event_hub.subscribe()
+        try:
+            yield f"retry: {RETRY_MILLISECONDS}\n\n"
+
+            last_seen = None
+            if last_event_id:
+                try:
+                    last_seen = parse_event_id(last_event_id)
+                    while True:
+                        missed = await read_events_after(last_event_id)
+                        for event in missed:
+                            last_event_id = event["id"]
+                            if not types or event["type"] in types:
+                                yield self.__format(event)
+                        if not missed:
+                            break
+                    last_seen = parse_event_id(last_event_id)
+                except (ValueError, ResponseError):
+                    last_seen = None
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                if event is None:
+                    break
+                # Already sent while catching up
+                if last_seen is not None and parse_event_id(event["id"]) <= last_seen:
+                    continue
+                if not types or event["type"] in types:
+                    yield self.__format(event)
+        finally:
+            order_event_hub.unsubscribe(queue)
+
+    def __format(self, event):
+        return f"id: {event['id']}\nevent: {event['type']}\ndata: {event['data']}\n\n"
\ No newline at end of file
@@ -1,78 +1,175 @@
 import logging
 from django.db import transaction
+from django.utils import timezone
 from rest_framework import viewsets, status
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework.decorators import action
 
 from app_core.middlewares.authentication import UserAuthentication
+from app_core.middlewares.permissions import IsManager
 from app_core.models.user import User
 from app_core.models.dining_table import DiningTable
 from app_core.serializers.order import (
     OrderSerializer, 
     UpdateOrderSerializer, 
     CreateOrderSerializer, 
+    KitchenQueueDishSerializer,
 )
 from app_core.models.order import Order, OrderStatus
 from app_core.models.order_item import OrderItem
-from app_core.helpers.paginator import CustomPageNumberPagination
+from app_core.models.daily_quantity import DailyQuantity
+from app_core.helpers.paginator import paginate_and_serialize
 from app_core.helpers.response import RestResponse
+from app_core.helpers.idempotency import idempotent, IDEMPOTENCY_KEY_PARAMETER
+from app_core.helpers.events import OrderEvent, publish_order_event, item_event_data
+from app_core.helpers.business_day import window_filter, parse_filter_date
+from app_core.helpers.export import export_response, EXPORT_FORMATS, EXPORT_FORMAT_PARAMETER
+from app_core.errors.exceptions import InvalidCursorException, InvalidDateFilterException, OutOfStockException
+
+def filter_orders(queryset, query_params):
+    """Apply the order list's filter and ``ordering`` params to ``queryset``.
+
+    Raises ``InvalidDateFilterException`` when ``date`` is not yyyy-mm-dd.
+    """
+    status_f = query_params.get("status", None)
+    if status_f:
+        queryset = queryset.filter(status=status_f)
+
+    customer_name = query_params.get("customer_name", None)
+    if customer_name:
+        queryset = queryset.filter(customer_name__icontains=customer_name)
+
+    customer_phone = query_params.get("customer_phone", None)
+    if customer_phone:
+        queryset = queryset.filter(customer_phone=customer_phone)
+
+    dining_table = query_params.get("dining_table", None)
+    if dining_table:
+        queryset = queryset.filter(dining_table=dining_table)
+
+    employee = query_params.get("employee", None)
+    if employee:
+        queryset = queryset.filter(employee=employee)
+
+    date_f = query_params.get("date", None)
+    if date_f:
+        queryset = queryset.filter(**window_filter("created_at", parse_filter_date(date_f)))
+
+    ordering = query_params.get("ordering", None)
+    if ordering == "subtotal":
+        queryset = queryset.order_by("subtotal", "id")
+    elif ordering == "-subtotal":
+        queryset = queryset.order_by("-subtotal", "-id")
+
+    return queryset
 
 class OrderView(viewsets.ViewSet):
     authentication_classes = (UserAuthentication, )
 
+    def get_permissions(self):
+        if self.action in ['export']:
+            return [IsManager()]
+        return []
+
     @swagger_auto_schema(responses={200: OrderSerializer(many=True)}, manual_parameters=[
         openapi.Parameter(name="page", in_="query", type=openapi.TYPE_INTEGER, required=False),
         openapi.Parameter(name="size", in_="query", type=openapi.TYPE_INTEGER, required=False),
+        openapi.Parameter(name="cursor", in_="query", type=openapi.TYPE_STRING, required=False, description="Keyset mode, send empty for the first page"),
         openapi.Parameter(name="status", in_="query", type=openapi.TYPE_STRING, required=False),
         openapi.Parameter(name="customer_name", in_="query", type=openapi.TYPE_STRING, required=False),
         openapi.Parameter(name="customer_phone", in_="query", type=openapi.TYPE_STRING, required=False),
         openapi.Parameter(name="dining_table", in_="query", type=openapi.TYPE_INTEGER, required=False),
         openapi.Parameter(name="employee", in_="query", type=openapi.TYPE_INTEGER, required=False),
         openapi.Parameter(name="date", in_="query", type=openapi.TYPE_STRING, required=False),
+        openapi.Parameter(name="ordering", in_="query", type=openapi.TYPE_STRING, required=False, enum=["subtotal", "-subtotal"], description="Ignored in keyset mode"),
     ])
     def list(self, request):
         try:
             logging.getLogger().info("OrderView.list req=%s", request.query_params)
-            queryset = Order.objects.filter()
-
-            status_f = request.query_params.get("status", None)
-            if status_f:
-                queryset = queryset.filter(status=status_f)
-
-            customer_name = request.query_params.get("customer_name", None)
-            if customer_name:
-                queryset = queryset.filter(customer_name__icontains=customer_name)
-
-            customer_phone = request.query_params.get("customer_phone", None)
-            if customer_phone:
-                queryset = queryset.filter(customer_phone=customer_phone)
-
-            dining_table = request.query_params.get("dining_table", None)
-            if dining_table:
-                queryset = queryset.filter(dining_table=dining_table)
+            queryset = filter_orders(Order.objects.for_read(), request.query_params)
+            data = paginate_and_serialize(request, queryset, OrderSerializer, allow_cursor=True)
+            return RestResponse(status=status.HTTP_200_OK, data=data).response
+        except InvalidCursorException:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Cursor không hợp lệ!").response
+        except InvalidDateFilterException:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Ngày phải là định dạng yyyy-mm-dd!").response
+        except Exception as e:
+            logging.getLogger().exception("OrderView.list exc=%s, req=%s", e, request.query_params)
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
 
-            employee = request.query_params.get("employee", None)
-            if employee:
-                queryset = queryset.filter(employee=employee)
+    @action(detail=False, methods=['GET'], url_path='export')
+    @swagger_auto_schema(manual_parameters=[
+        EXPORT_FORMAT_PARAMETER,
+        openapi.Parameter(name="status", in_="query", type=openapi.TYPE_STRING, required=False),
+        openapi.Parameter(name="customer_name", in_="query", type=openapi.TYPE_STRING, required=False),
+        openapi.Parameter(name="customer_phone", in_="query", type=openapi.TYPE_STRING, required=False),
+        openapi.Parameter(name="dining_table", in_="query", type=openapi.TYPE_INTEGER, required=False),
+        openapi.Parameter(name="employee", in_="query", type=openapi.TYPE_INTEGER, required=False),
+        openapi.Parameter(name="date", in_="query", type=openapi.TYPE_STRING, required=False),
+    ])
+    def export(self, request):
+        try:
+            logging.getLogger().info("OrderView.export req=%s", request.query_params)
+            export_format = request.query_params.get("file_format", "csv")
+            if export_format not in EXPORT_FORMATS:
+                return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Định dạng tệp phải là csv hoặc xlsx!").response
 
-            date = request.query_params.get("date", None)
-            if date:
-                queryset = queryset.filter(created_at__date=date)
+            queryset = filter_orders(Order.objects.all(), request.query_params)
+            return export_response(
+                export_format, "orders",
+                ["id", "customer_name", "customer_phone", "dining_table", "employee", "status", "item_count", "subtotal", "note", "created_at", "finished_at"],
+                queryset,
+                ["id", "customer_name", "customer_phone", "dining_table__code", "employee__fullname", "status", "item_count", "subtotal", "note", "created_at", "finished_at"],
+            )
+        except InvalidDateFilterException:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Ngày phải là định dạng yyyy-mm-dd!").response
+        except Exception as e:
+            logging.getLogger().exception("OrderView.export exc=%s, req=%s", e, request.query_params)
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
 
-            serializer = OrderSerializer(queryset, many=True)
-            paginator = CustomPageNumberPagination()
-            queryset = paginator.paginate_queryset(queryset, request)
-            return RestResponse(status=status.HTTP_200_OK, data=paginator.get_paginated_data(serializer.data)).response
+    @action(detail=False, methods=['GET'], url_path='kitchen-queue')
+    @swagger_auto_schema(responses={200: KitchenQueueDishSerializer(many=True)})
+    def kitchen_queue(self, request):
+        try:
+            logging.getLogger().info("OrderView.kitchen_queue req=%s", request.query_params)
+            queue = self.__build_kitchen_queue(OrderItem.objects.kitchen_tickets())
+            serializer = KitchenQueueDishSerializer(queue, many=True)
+            return RestResponse(status=status.HTTP_200_OK, data=serializer.data).response
         except Exception as e:
-            logging.getLogger().exception("OrderView.list exc=%s, req=%s", e, request.query_params)
+            logging.getLogger().exception("OrderView.kitchen_queue exc=%s, req=%s", e, request.query_params)
             return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
 
+    def __build_kitchen_queue(self, tickets):
+        """Fold ticket rows into one entry per dish, the longest waiting dish first."""
+        now = timezone.now()
+        queue = {}
+        for ticket in tickets:
+            entry = queue.setdefault(ticket["kitchen_dish"], {
+                "dish": ticket["kitchen_dish"],
+                "dish_name": ticket["kitchen_dish_name"],
+                "quantity": 0,
+                "tables": [],
+                "notes": [],
+                "oldest_ticket_at": ticket["ticket_at"],
+            })
+            entry["quantity"] += ticket["portions"]
+            if ticket["table_code"] not in entry["tables"]:
+                entry["tables"].append(ticket["table_code"])
+            if ticket["note"]:
+                entry["notes"].append({"table": ticket["table_code"], "combo": ticket["combo_name"], "note": ticket["note"]})
+            entry["oldest_ticket_at"] = min(entry["oldest_ticket_at"], ticket["ticket_at"])
+
+        for entry in queue.values():
+            entry["tables"].sort()
+            entry["waiting_seconds"] = int((now - entry["oldest_ticket_at"]).total_seconds())
+        return sorted(queue.values(), key=lambda entry: (entry["oldest_ticket_at"], entry["dish"]))
+
     @swagger_auto_schema(responses={200: OrderSerializer})
     def retrieve(self, request, pk=None):
         try:
             logging.getLogger().info("OrderView.retrieve pk=%s", pk)
-            queryset = Order.objects.get(pk=pk)
+            queryset = Order.objects.for_read().get(pk=pk)
             serializer = OrderSerializer(queryset)
             return RestResponse(status=status.HTTP_200_OK, data=serializer.data).response
         except Order.DoesNotExist:
@@ -81,7 +178,8 @@ class OrderView(viewsets.ViewSet):
             logging.getLogger().exception("OrderView.retrieve exc=%s, pk=%s", e, pk)
             return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
 
-    @swagger_auto_schema(responses={200: OrderSerializer}, request_body=CreateOrderSerializer)
+    @swagger_auto_schema(responses={200: OrderSerializer}, request_body=CreateOrderSerializer, manual_parameters=[IDEMPOTENCY_KEY_PARAMETER])
+    @idempotent
     def create(self, request):
         try:
             logging.getLogger().info("OrderView.create req=%s", request.data)
@@ -94,19 +192,40 @@ class OrderView(viewsets.ViewSet):
 
             table = serializer.validated_data['dining_table']
 
-            if table.orders.filter(status=OrderStatus.PENDING).exists():
-                return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Bàn ăn hiện tại đang được sử dụng!").response
-
             with transaction.atomic():
+                # The row lock serializes order creation per table across every app node,
+                # so the pending-order check below cannot race with another request.
+                DiningTable.objects.select_for_update().get(pk=table.pk)
+
+                if table.orders.filter(status=OrderStatus.PENDING).exists():
+                    return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Bàn ăn hiện tại đang được sử dụng!").response
+
+                items = [OrderItem(**item) for item in order_items_data]
+                for item in items:
+                    item.capture_unit_price()
+
                 order = Order.objects.create(
                     status=OrderStatus.PENDING,
                     employee=request.user,
+                    subtotal=sum(item.unit_price * item.quantity for item in items),
+                    item_count=sum(item.quantity for item in items),
                     **serializer.validated_data
                 )
-                items = [OrderItem(order=order, **item) for item in order_items_data]
+                for item in items:
+                    item.order = order
+                DailyQuantity.reserve_items(order.get_day(), items)
                 OrderItem.objects.bulk_create(items)
+                publish_order_event(OrderEvent.ORDER_CREATED, {
+                    "order": order.id,
+                    "dining_table": order.dining_table_id,
+                    "subtotal": order.subtotal,
+                    "item_count": order.item_count,
+                    "items": [item_event_data(item) for item in items],
+                })
 
             return RestResponse(status=status.HTTP_200_OK, data=OrderSerializer(order).data).response
+        except OutOfStockException as e:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, data={"type": e.item_type, "id": e.item_id}, message="Số lượng còn lại trong ngày không đủ!").response
         except Exception as e:
             logging.getLogger().exception("OrderView.create exc=%s, req=%s", e, request.data)
             return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
@@ -119,14 +238,16 @@ class OrderView(viewsets.ViewSet):
             if not serializer.is_valid():
                 return RestResponse(status=status.HTTP_400_BAD_REQUEST, data=serializer.errors, message="Vui lòng kiểm tra lại dữ liệu!").response
 
-            queryset = Order.objects.get(pk=pk)
+            with transaction.atomic():
+                # Only the sent fields are written back, so totals moved by concurrent item changes are kept
+                queryset = Order.objects.select_for_update().get(pk=pk)
 
-            if queryset.status != OrderStatus.PENDING:
-                return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Không thể cập nhật đơn đặt bàn đã hoàn thành!").response
+                if queryset.status != OrderStatus.PENDING:
+                    return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Không thể cập nhật đơn đặt bàn đã hoàn thành!").response
 
-            for key, value in serializer.validated_data.items():
-                setattr(queryset, key, value)
-            queryset.save()
+                for key, value in serializer.validated_data.items():
+                    setattr(queryset, key, value)
+                queryset.save(update_fields=[*serializer.validated_data, "updated_at"])
 
             return RestResponse(status=status.HTTP_200_OK).response
         except Order.DoesNotExist:
@@ -139,13 +260,17 @@ class OrderView(viewsets.ViewSet):
     def cancel(self, request, pk=None):
         try:
             logging.getLogger().info("OrderView.cancel pk=%s", pk)
-            queryset = Order.objects.get(pk=pk)
+            with transaction.atomic():
+                # Checked under the row lock, so a bill committed meanwhile cannot be turned into a cancellation
+                queryset = Order.objects.select_for_update().get(pk=pk)
 
-            if queryset.status != OrderStatus.PENDING:
-                return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Không thể hủy đơn đặt bàn!").response
+                if queryset.status != OrderStatus.PENDING:
+                    return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Không thể hủy đơn đặt bàn!").response
 
-            queryset.status = OrderStatus.CANCELLED
-            queryset.save()
+                queryset.status = OrderStatus.CANCELLED
+                queryset.save(update_fields=["status", "updated_at"])
+                DailyQuantity.release_items(queryset.get_day(), queryset.order_items.select_for_update().filter(deleted_at=None))
+                publish_order_event(OrderEvent.ORDER_CANCELLED, {"order": queryset.id, "dining_table": queryset.dining_table_id})
             return RestResponse(status=status.HTTP_200_OK).response
         except Order.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy đơn đặt bàn!").response
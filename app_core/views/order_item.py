@@ -1,22 +1,39 @@
 import logging
 from datetime import datetime
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import viewsets, status
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser
 
 from app_core.middlewares.authentication import UserAuthentication
 from app_core.serializers.order import (
+    OrderSerializer,
     CreateOrderItemSerializer, 
-    UpdateOrderItemSerializer
+    UpdateOrderItemSerializer,
+    BulkOrderItemSerializer
 )
 from app_core.models.order import Order, OrderStatus
 from app_core.models.order_item import OrderItem
+from app_core.models.daily_quantity import DailyQuantity
 from app_core.helpers.response import RestResponse
+from app_core.helpers.idempotency import idempotent, IDEMPOTENCY_KEY_PARAMETER
+from app_core.helpers.events import OrderEvent, publish_order_event, item_event_data
+from app_core.errors.exceptions import OutOfStockException
 
 class OrderItemView(viewsets.ViewSet):
     authentication_classes = (UserAuthentication, )
 
-    @swagger_auto_schema(request_body=CreateOrderItemSerializer)
+    def __lock_item(self, pk):
+        """Lock the item's order, then the item, in the same order as the other item writes."""
+        order_id = OrderItem.objects.values_list('order_id', flat=True).get(pk=pk, deleted_at=None)
+        order = Order.objects.select_for_update().get(pk=order_id)
+        item = OrderItem.objects.select_for_update().get(pk=pk, deleted_at=None)
+        return order, item
+
+    @swagger_auto_schema(request_body=CreateOrderItemSerializer, manual_parameters=[IDEMPOTENCY_KEY_PARAMETER])
+    @idempotent
     def create(self, request):
         try:
             logging.getLogger().info("OrderItemView.create req=%s", request.data)
@@ -24,10 +41,20 @@ class OrderItemView(viewsets.ViewSet):
             if not serializer.is_valid():
                 return RestResponse(status=status.HTTP_400_BAD_REQUEST, data=serializer.errors, message="Vui lòng kiểm tra lại dữ liệu!").response
 
-            OrderItem.objects.create(
-                **serializer.validated_data
-            )
+            with transaction.atomic():
+                order = Order.objects.select_for_update().get(pk=serializer.validated_data['order'].pk)
+
+                if order.status != OrderStatus.PENDING:
+                    return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Không thể thêm sản phẩm vào đơn đặt bàn đã hoàn thành!").response
+
+                item = OrderItem(**serializer.validated_data)
+                DailyQuantity.reserve(order.get_day(), item.type, item.item_id, item.quantity)
+                item.save()
+                Order.add_to_totals(order.pk, item.unit_price * item.quantity, item.quantity)
+                publish_order_event(OrderEvent.ITEM_ADDED, item_event_data(item))
             return RestResponse(status=status.HTTP_200_OK).response
+        except OutOfStockException as e:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, data={"type": e.item_type, "id": e.item_id}, message="Số lượng còn lại trong ngày không đủ!").response
         except Exception as e:
             logging.getLogger().exception("OrderItemView.create exc=%s, req=%s", e, request.data)
             return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
@@ -40,15 +67,23 @@ class OrderItemView(viewsets.ViewSet):
             if not serializer.is_valid():
                 return RestResponse(status=status.HTTP_400_BAD_REQUEST, data=serializer.errors, message="Vui lòng kiểm tra lại dữ liệu!").response
             
-            queryset = OrderItem.objects.get(pk=pk, deleted_at=None)
+            with transaction.atomic():
+                order, queryset = self.__lock_item(pk)
 
-            if queryset.order.status != OrderStatus.PENDING:
-                return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Không thể cập nhật sản phẩm của đơn đặt bàn đã hoàn thành!").response
+                if order.status != OrderStatus.PENDING:
+                    return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Không thể cập nhật sản phẩm của đơn đặt bàn đã hoàn thành!").response
 
-            for key, value in serializer.validated_data.items():
-                setattr(queryset, key, value)
-            queryset.save()
+                previous_quantity = queryset.quantity
+                for key, value in serializer.validated_data.items():
+                    setattr(queryset, key, value)
+                delta = queryset.quantity - previous_quantity
+                DailyQuantity.reserve(order.get_day(), queryset.type, queryset.item_id, delta)
+                queryset.save()
+                Order.add_to_totals(order.pk, queryset.price * delta, delta)
+                publish_order_event(OrderEvent.ITEM_UPDATED, item_event_data(queryset))
             return RestResponse(status=status.HTTP_200_OK).response
+        except OutOfStockException as e:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, data={"type": e.item_type, "id": e.item_id}, message="Số lượng còn lại trong ngày không đủ!").response
         except OrderItem.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy sản phẩm!").response
         except Exception as e:
@@ -58,16 +93,95 @@ class OrderItemView(viewsets.ViewSet):
     def destroy(self, request, pk=None):
         try:
             logging.getLogger().info("OrderItemView.destroy pk=%s", pk)
-            queryset = OrderItem.objects.get(pk=pk, deleted_at=None)
+            with transaction.atomic():
+                order, queryset = self.__lock_item(pk)
 
-            if queryset.order.status != OrderStatus.PENDING:
-                return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Không thể xóa sản phẩm khỏi đơn đặt bàn đã hoàn thành!").response
+                if order.status != OrderStatus.PENDING:
+                    return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Không thể xóa sản phẩm khỏi đơn đặt bàn đã hoàn thành!").response
 
-            queryset.deleted_at = datetime.now()
-            queryset.save()
+                queryset.deleted_at = datetime.now()
+                queryset.save()
+                DailyQuantity.release(order.get_day(), queryset.type, queryset.item_id, queryset.quantity)
+                Order.add_to_totals(order.pk, -queryset.price * queryset.quantity, -queryset.quantity)
+                publish_order_event(OrderEvent.ITEM_REMOVED, item_event_data(queryset))
             return RestResponse(status=status.HTTP_200_OK).response
         except OrderItem.DoesNotExist:
             return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy sản phẩm!").response
         except Exception as e:
             logging.getLogger().exception("OrderItemView.destroy exc=%s, pk=%s", e, pk)
-            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
\ No newline at end of file
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
+
+    @action(detail=False, methods=['POST'], parser_classes=(JSONParser, ), url_path='bulk')
+    @swagger_auto_schema(request_body=BulkOrderItemSerializer, responses={200: OrderSerializer}, manual_parameters=[IDEMPOTENCY_KEY_PARAMETER])
+    @idempotent
+    def bulk(self, request):
+        try:
+            logging.getLogger().info("OrderItemView.bulk req=%s", request.data)
+            serializer = BulkOrderItemSerializer(data=request.data)
+            if not serializer.is_valid():
+                return RestResponse(status=status.HTTP_400_BAD_REQUEST, data=serializer.errors, message="Vui lòng kiểm tra lại dữ liệu!").response
+
+            updates = {item.pop("id"): item for item in serializer.validated_data.get("update", [])}
+            remove_ids = serializer.validated_data.get("remove", [])
+
+            with transaction.atomic():
+                order = Order.objects.select_for_update().get(pk=serializer.validated_data["order"].pk)
+
+                if order.status != OrderStatus.PENDING:
+                    return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Không thể cập nhật sản phẩm của đơn đặt bàn đã hoàn thành!").response
+
+                existing = {
+                    item.id: item
+                    for item in OrderItem.objects.select_for_update().filter(order=order, deleted_at=None, id__in=[*updates, *remove_ids])
+                }
+                missing = [pk for pk in [*updates, *remove_ids] if pk not in existing]
+                if missing:
+                    return RestResponse(status=status.HTTP_404_NOT_FOUND, data={"ids": missing}, message="Không tìm thấy sản phẩm!").response
+
+                added = [OrderItem(order=order, **item) for item in serializer.validated_data.get("add", [])]
+                for item in added:
+                    item.capture_unit_price()
+                deltas = [(item, item.quantity) for item in added]
+
+                updated = []
+                now = timezone.now()
+                for pk, data in updates.items():
+                    item = existing[pk]
+                    previous_quantity = item.quantity
+                    for key, value in data.items():
+                        setattr(item, key, value)
+                    item.updated_at = now
+                    deltas.append((item, item.quantity - previous_quantity))
+                    updated.append(item)
+
+                deltas += [(existing[pk], -existing[pk].quantity) for pk in remove_ids]
+
+                changes = {}
+                for item, delta in deltas:
+                    key = (item.type, item.item_id)
+                    changes[key] = changes.get(key, 0) + delta
+
+                DailyQuantity.apply_changes(order.get_day(), changes)
+                OrderItem.objects.bulk_create(added)
+                OrderItem.objects.bulk_update(updated, ["quantity", "note", "updated_at"])
+                OrderItem.objects.filter(id__in=remove_ids).update(deleted_at=now, updated_at=now)
+                Order.add_to_totals(
+                    order.pk,
+                    sum(item.price * delta for item, delta in deltas),
+                    sum(delta for _, delta in deltas)
+                )
+                # Ids of added items are only known on backends that return them from bulk_create
+                publish_order_event(OrderEvent.ORDER_ITEMS_CHANGED, {
+                    "order": order.pk,
+                    "added": [item_event_data(item) for item in added],
+                    "updated": [item_event_data(item) for item in updated],
+                    "removed": remove_ids,
+                })
+
+            order = Order.objects.for_read().get(pk=order.pk)
+            return RestResponse(status=status.HTTP_200_OK, data=OrderSerializer(order).data).response
+        except OutOfStockException as e:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, data={"type": e.item_type, "id": e.item_id}, message="Số lượng còn lại trong ngày không đủ!").response
+        except Exception as e:
+            logging.getLogger().exception("OrderItemView.bulk exc=%s, req=%s", e, request.data)
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
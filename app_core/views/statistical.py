@@ -2,19 +2,34 @@ import logging
 from rest_framework import viewsets, status
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from datetime import datetime
-from django.db.models import Sum, Count, F
-from django.db.models.functions import TruncDate
+from datetime import datetime, timedelta
+from django.db.models import Count
+from django.db.models.functions import Coalesce
 from collections import defaultdict
+from django.conf import settings
+from django.urls import reverse
 from rest_framework.decorators import action
 
 from app_core.middlewares.authentication import UserAuthentication
 from app_core.middlewares.permissions import IsManager
 from app_core.helpers.response import RestResponse
+from app_core.helpers.segment_cache import get_day_segments, EMPLOYEE_PERFORMANCE_SEGMENT
+from app_core.helpers.business_day import business_day_of, window_filter
+from app_core.helpers.export import export_response, EXPORT_FORMATS, EXPORT_FORMAT_PARAMETER
+from app_core.helpers.single_flight import coalesced
+from app_core.helpers.report_jobs import submit_report_job, get_report_job, get_report_result, ReportJobStatus
+from app_core.serializers.statistical import CreateReportJobSerializer, ReportType
+from app_core.errors.exceptions import ReportJobQueueFullException
 from app_core.models.bill import Bill
-from app_core.models.order_item import OrderItem, OrderItemType
+from app_core.models.daily_revenue import DailyRevenue
+from app_core.models.daily_item_sales import DailyItemSales
+from app_core.models.order_item import OrderItemType
 from app_core.models.order import Order
 
+# Dashboards poll these; a response may be up to this many seconds behind new bills
+STATISTICS_FRESH_FOR = 30
+STATISTICS_STALE_FOR = 5 * 60
+
 class StatisticalView(viewsets.ViewSet):
     authentication_classes = (UserAuthentication, )
     permission_classes = (IsManager, )
@@ -24,6 +39,7 @@ class StatisticalView(viewsets.ViewSet):
         openapi.Parameter(name="start_date", in_="query", type=openapi.TYPE_STRING, required=True),
         openapi.Parameter(name="end_date", in_="query", type=openapi.TYPE_STRING, required=True),
     ])
+    @coalesced(fresh_for=STATISTICS_FRESH_FOR, stale_for=STATISTICS_STALE_FOR)
     def revenue(self, request):
         try:
             logging.getLogger().info("StatisticalView.revenue req=%s", request.query_params)
@@ -39,15 +55,16 @@ class StatisticalView(viewsets.ViewSet):
             if start_date > end_date:
                 return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Ngày bắt đầu phải nhỏ hơn hoặc bằng ngày kết thúc!").response
 
-            queryset = Bill.objects.filter(created_at__date__range=[start_date, end_date])
-            total_revenue = queryset.aggregate(total_revenue=Sum('total_amount'))['total_revenue']
-            revenue_by_date = queryset.values('created_at__date').annotate(total_revenue=Sum('total_amount')).annotate(date=F('created_at__date'))
-            bill_by_date = queryset.values('created_at__date').annotate(number_of_bills=Count('id')).annotate(date=F('created_at__date'))
+            rollups = list(
+                DailyRevenue.objects.filter(date__range=[start_date, end_date], bill_count__gt=0).order_by('date')
+            )
+            revenue_by_date = [{"created_at__date": r.date, "total_revenue": r.revenue, "date": r.date} for r in rollups]
+            bill_by_date = [{"created_at__date": r.date, "number_of_bills": r.bill_count, "date": r.date} for r in rollups]
             data = {
                 "revenue_by_date": revenue_by_date,
                 "bill_by_date": bill_by_date,
-                "total_revenue": total_revenue,
-                "number_of_bills": queryset.count(),
+                "total_revenue": sum(r.revenue for r in rollups) if rollups else None,
+                "number_of_bills": sum(r.bill_count for r in rollups),
                 "number_of_days": (end_date - start_date).days + 1,
                 "from": start_date_str,
                 "to": end_date_str,
@@ -64,6 +81,7 @@ class StatisticalView(viewsets.ViewSet):
         openapi.Parameter(name="start_date", in_="query", type=openapi.TYPE_STRING, required=True),
         openapi.Parameter(name="end_date", in_="query", type=openapi.TYPE_STRING, required=True),
     ])
+    @coalesced(fresh_for=STATISTICS_FRESH_FOR, stale_for=STATISTICS_STALE_FOR)
     def dish_and_combo_sold(self, request):
         try:
             logging.getLogger().info("StatisticalView.dish_and_combo_sold req=%s", request.query_params)
@@ -79,72 +97,103 @@ class StatisticalView(viewsets.ViewSet):
             if start_date > end_date:
                 return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Ngày bắt đầu phải nhỏ hơn hoặc bằng ngày kết thúc!").response
 
-            bills = Bill.objects.filter(created_at__date__range=[start_date, end_date])
-            order_items = OrderItem.objects.filter(order__bills__in=bills)
+            if self.__is_long_range(start_date, end_date):
+                return self.__submit_report_job(ReportType.DISH_AND_COMBO_SOLD, start_date, end_date)
 
-            dish_qs = (
-                order_items.filter(type=OrderItemType.DISH)
-                .annotate(date=TruncDate('order__bills__created_at'))
-                .values('date', 'dish__id', 'dish__name')
-                .annotate(total_quantity=Sum('quantity'))
-                .order_by('-date', '-total_quantity')
-            )
+            data = self.__build_dish_and_combo_sold(start_date, end_date)
+            return RestResponse(status=status.HTTP_200_OK, data=data, message="Thành công!").response
 
-            combo_qs = (
-                order_items.filter(type=OrderItemType.COMBO)
-                .annotate(date=TruncDate('order__bills__created_at'))
-                .values('date', 'combo__id', 'combo__name')
-                .annotate(total_quantity=Sum('quantity'))
-                .order_by('-date', '-total_quantity')
-            )
+        except ValueError:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Ngày bắt đầu và ngày kết thúc phải là định dạng yyyy-mm-dd!").response
+        except ReportJobQueueFullException:
+            return RestResponse(status=status.HTTP_503_SERVICE_UNAVAILABLE, message="Hệ thống đang bận, vui lòng thử lại sau!").response
+        except Exception as e:
+            logging.getLogger().exception("StatisticalView.dish_and_combo_sold exc=%s, req=%s", e, request.query_params)
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
 
-            grouped_by_date = defaultdict(lambda: {"dishes": [], "combos": []})
-            for r in dish_qs:
+    def __build_dish_and_combo_sold(self, start_date, end_date):
+        rows = (
+            DailyItemSales.objects.filter(date__range=[start_date, end_date], quantity__gt=0)
+            .values('date', 'type', 'dish__id', 'dish__name', 'combo__id', 'combo__name', 'quantity')
+        )
+
+        grouped_by_date = defaultdict(lambda: {"dishes": [], "combos": []})
+        dish_totals = {}
+        combo_totals = {}
+        for r in rows:
+            if r['type'] == OrderItemType.DISH:
                 grouped_by_date[r['date']]["dishes"].append({
                     "dish_id": r['dish__id'],
                     "dish_name": r['dish__name'],
-                    "total_quantity": r['total_quantity'],
+                    "total_quantity": r['quantity'],
                 })
-            for r in combo_qs:
+                total = dish_totals.setdefault(r['dish__id'], {"dish_id": r['dish__id'], "dish_name": r['dish__name'], "total_quantity": 0})
+                total["total_quantity"] += r['quantity']
+            else:
                 grouped_by_date[r['date']]["combos"].append({
                     "combo_id": r['combo__id'],
                     "combo_name": r['combo__name'],
-                    "total_quantity": r['total_quantity'],
+                    "total_quantity": r['quantity'],
                 })
+                total = combo_totals.setdefault(r['combo__id'], {"combo_id": r['combo__id'], "combo_name": r['combo__name'], "total_quantity": 0})
+                total["total_quantity"] += r['quantity']
+
+        by_date = []
+        for d in sorted(grouped_by_date.keys(), reverse=True):
+            by_date.append({
+                "date": d,
+                "dishes": sorted(grouped_by_date[d]["dishes"], key=lambda x: -x["total_quantity"]),
+                "combos": sorted(grouped_by_date[d]["combos"], key=lambda x: -x["total_quantity"]),
+            })
+
+        top_5_dishes = sorted(dish_totals.values(), key=lambda x: -x["total_quantity"])[:5]
+        top_5_combos = sorted(combo_totals.values(), key=lambda x: -x["total_quantity"])[:5]
+
+        return {
+            "by_date": by_date,
+            "top_5_dishes": top_5_dishes,
+            "top_5_combos": top_5_combos,
+        }
+
+    @action(detail=False, methods=['GET'], url_path='item-sales/export')
+    @swagger_auto_schema(manual_parameters=[
+        EXPORT_FORMAT_PARAMETER,
+        openapi.Parameter(name="start_date", in_="query", type=openapi.TYPE_STRING, required=True),
+        openapi.Parameter(name="end_date", in_="query", type=openapi.TYPE_STRING, required=True),
+    ])
+    def export_item_sales(self, request):
+        try:
+            logging.getLogger().info("StatisticalView.export_item_sales req=%s", request.query_params)
+            export_format = request.query_params.get("file_format", "csv")
+            if export_format not in EXPORT_FORMATS:
+                return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Định dạng tệp phải là csv hoặc xlsx!").response
 
-            by_date = []
-            for d in sorted(grouped_by_date.keys(), reverse=True):
-                by_date.append({
-                    "date": d,
-                    "dishes": grouped_by_date[d]["dishes"],
-                    "combos": grouped_by_date[d]["combos"],
-                })
+            start_date_str = request.query_params.get("start_date", None)
+            end_date_str = request.query_params.get("end_date", None)
 
-            top_5_dishes = (
-                order_items.filter(type=OrderItemType.DISH)
-                .values('dish__id', 'dish__name')
-                .annotate(total_quantity=Sum('quantity'))
-                .order_by('-total_quantity')[:5]
-            )
-            top_5_dishes = [{"dish_id": r["dish__id"], "dish_name": r["dish__name"], "total_quantity": r["total_quantity"]} for r in top_5_dishes]
+            if not start_date_str or not end_date_str:
+                return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Ngày bắt đầu và ngày kết thúc là bắt buộc!").response
 
-            top_5_combos = (
-                order_items.filter(type=OrderItemType.COMBO)
-                .values('combo__id', 'combo__name')
-                .annotate(total_quantity=Sum('quantity'))
-                .order_by('-total_quantity')[:5]
-            )
-            top_5_combos = [{"combo_id": r["combo__id"], "combo_name": r["combo__name"], "total_quantity": r["total_quantity"]} for r in top_5_combos]
+            start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
+            end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
 
-            data = {
-                "by_date": by_date,
-                "top_5_dishes": top_5_dishes,
-                "top_5_combos": top_5_combos,
-            }
-            return RestResponse(status=status.HTTP_200_OK, data=data, message="Thành công!").response
+            if start_date > end_date:
+                return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Ngày bắt đầu phải nhỏ hơn hoặc bằng ngày kết thúc!").response
 
+            queryset = (
+                DailyItemSales.objects.filter(date__range=[start_date, end_date], quantity__gt=0)
+                .annotate(item_id=Coalesce('dish_id', 'combo_id'), item_name=Coalesce('dish__name', 'combo__name'))
+            )
+            return export_response(
+                export_format, f"item_sales_{start_date}_{end_date}",
+                ["date", "type", "item_id", "item_name", "quantity"],
+                queryset,
+                ["date", "type", "item_id", "item_name", "quantity"],
+            )
+        except ValueError:
+            return RestResponse(status=status.HTTP_400_BAD_REQUEST, message="Ngày bắt đầu và ngày kết thúc phải là định dạng yyyy-mm-dd!").response
         except Exception as e:
-            logging.getLogger().exception("StatisticalView.dish_and_combo_sold exc=%s, req=%s", e, request.query_params)
+            logging.getLogger().exception("StatisticalView.export_item_sales exc=%s, req=%s", e, request.query_params)
             return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
 
     @action(detail=False, methods=['GET'], url_path='employee-performance')
@@ -153,6 +202,7 @@ class StatisticalView(viewsets.ViewSet):
         openapi.Parameter(name="end_date", in_="query", type=openapi.TYPE_STRING, required=True),
         openapi.Parameter(name="employee", in_="query", type=openapi.TYPE_INTEGER, required=False),
     ])
+    @coalesced(fresh_for=STATISTICS_FRESH_FOR, stale_for=STATISTICS_STALE_FOR)
     def employee_performance(self, request):
         try:
             logging.getLogger().info("StatisticalView.employee_performance req=%s", request.query_params)
@@ -175,74 +225,188 @@ class StatisticalView(viewsets.ViewSet):
                     message="Ngày bắt đầu phải nhỏ hơn hoặc bằng ngày kết thúc!"
                 ).response
 
-            bills = Bill.objects.filter(created_at__date__range=[start_date, end_date])
+            if self.__is_long_range(start_date, end_date):
+                return self.__submit_report_job(ReportType.EMPLOYEE_PERFORMANCE, start_date, end_date, employee_id)
 
-            if employee_id:
-                bills = bills.filter(created_by__id=employee_id)
+            data = self.__build_employee_performance(start_date, end_date, employee_id)
+            return RestResponse(status=status.HTTP_200_OK, data=data).response
 
-            bills_by_employee = (
-                bills.values('created_by__id', 'created_by__fullname')
-                .annotate(number_of_bills=Count('id'))
-                .order_by('-number_of_bills')
-            )
+        except ValueError:
+            return RestResponse(
+                status=status.HTTP_400_BAD_REQUEST,
+                message="Ngày bắt đầu và ngày kết thúc phải là định dạng yyyy-mm-dd!"
+            ).response
+        except ReportJobQueueFullException:
+            return RestResponse(
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                message="Hệ thống đang bận, vui lòng thử lại sau!"
+            ).response
+        except Exception as e:
+            logging.getLogger().exception("StatisticalView.employee_performance exc=%s, req=%s", e, request.query_params)
+            return RestResponse(
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                data={"error": str(e)}
+            ).response
 
-            orders_by_employee = (
-                Order.objects.filter(bills__in=bills)
-                .values('employee__id', 'employee__fullname')
-                .annotate(number_of_orders=Count('id'))
-                .order_by('-number_of_orders')
-            )
+    @action(detail=False, methods=['POST'], url_path='jobs')
+    @swagger_auto_schema(request_body=CreateReportJobSerializer)
+    def create_job(self, request):
+        try:
+            logging.getLogger().info("StatisticalView.create_job req=%s", request.data)
+            serializer = CreateReportJobSerializer(data=request.data)
 
-            bills_per_date_qs = (
-                bills.annotate(date=TruncDate('created_at'))
-                .values('date', 'created_by__id', 'created_by__fullname')
-                .annotate(number_of_bills=Count('id'))
-                .order_by('-date')
-            )
+            if not serializer.is_valid():
+                return RestResponse(status=status.HTTP_400_BAD_REQUEST, data=serializer.errors, message="Vui lòng kiểm tra lại dữ liệu!").response
 
-            orders_per_date_qs = (
-                Order.objects.filter(bills__in=bills)
-                .annotate(date=TruncDate('created_at'))
-                .values('date', 'employee__id', 'employee__fullname')
-                .annotate(number_of_orders=Count('id'))
-                .order_by('-date')
-            )
+            data = serializer.validated_data
+            return self.__submit_report_job(data['report'], data['start_date'], data['end_date'], data.get('employee'))
+        except ReportJobQueueFullException:
+            return RestResponse(status=status.HTTP_503_SERVICE_UNAVAILABLE, message="Hệ thống đang bận, vui lòng thử lại sau!").response
+        except Exception as e:
+            logging.getLogger().exception("StatisticalView.create_job exc=%s, req=%s", e, request.data)
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
+
+    @action(detail=False, methods=['GET'], url_path=r'jobs/(?P<job_id>[0-9a-f]{32})')
+    def job(self, request, job_id=None):
+        try:
+            logging.getLogger().info("StatisticalView.job job_id=%s", job_id)
+            job = get_report_job(job_id)
+            if job is None:
+                return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy báo cáo!").response
+
+            return RestResponse(status=status.HTTP_200_OK, data=job).response
+        except Exception as e:
+            logging.getLogger().exception("StatisticalView.job exc=%s, job_id=%s", e, job_id)
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
+
+    @action(detail=False, methods=['GET'], url_path=r'jobs/(?P<job_id>[0-9a-f]{32})/result')
+    def job_result(self, request, job_id=None):
+        try:
+            logging.getLogger().info("StatisticalView.job_result job_id=%s", job_id)
+            job = get_report_job(job_id)
+            if job is None:
+                return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Không tìm thấy báo cáo!").response
+
+            if job["status"] == ReportJobStatus.FAILED:
+                return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": job["error"]}).response
+
+            if job["status"] != ReportJobStatus.SUCCEEDED:
+                return RestResponse(status=status.HTTP_409_CONFLICT, data=job, message="Báo cáo chưa xử lý xong!").response
+
+            result = get_report_result(job_id)
+            if result is None:
+                return RestResponse(status=status.HTTP_404_NOT_FOUND, message="Kết quả báo cáo đã hết hạn!").response
 
-            bills_grouped = defaultdict(list)
-            for r in bills_per_date_qs:
-                bills_grouped[r['date']].append({
+            return RestResponse(status=status.HTTP_200_OK, data=result).response
+        except Exception as e:
+            logging.getLogger().exception("StatisticalView.job_result exc=%s, job_id=%s", e, job_id)
+            return RestResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"error": str(e)}).response
+
+    def __build_employee_performance(self, start_date, end_date, employee_id=None):
+        days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        segments = get_day_segments(EMPLOYEE_PERFORMANCE_SEGMENT, days, self.__compute_employee_performance_segments)
+
+        bills_totals = {}
+        orders_totals = {}
+        bills_grouped = defaultdict(list)
+        orders_grouped = defaultdict(dict)
+        for day, segment in segments.items():
+            for r in segment["bills"]:
+                if employee_id and str(r["employee_id"]) != employee_id:
+                    continue
+                bills_grouped[day].append(dict(r))
+                total = bills_totals.setdefault(r["employee_id"], {
+                    "created_by__id": r["employee_id"],
+                    "created_by__fullname": r["employee_name"],
+                    "number_of_bills": 0,
+                })
+                total["number_of_bills"] += r["number_of_bills"]
+
+            for r in segment["orders"]:
+                if employee_id and str(r["bill_created_by"]) != employee_id:
+                    continue
+                total = orders_totals.setdefault(r["employee_id"], {
+                    "employee__id": r["employee_id"],
+                    "employee__fullname": r["employee_name"],
+                    "number_of_orders": 0,
+                })
+                total["number_of_orders"] += r["number_of_orders"]
+                per_date = orders_grouped[r["order_date"]].setdefault(r["employee_id"], {
+                    "employee_id": r["employee_id"],
+                    "employee_name": r["employee_name"],
+                    "number_of_orders": 0,
+                })
+                per_date["number_of_orders"] += r["number_of_orders"]
+
+        bills_by_employee = sorted(bills_totals.values(), key=lambda x: -x["number_of_bills"])
+        orders_by_employee = sorted(orders_totals.values(), key=lambda x: -x["number_of_orders"])
+
+        bills_by_employee_per_date = [
+            {"date": d, "employees": sorted(bills_grouped[d], key=lambda x: -x["number_of_bills"])}
+            for d in sorted(bills_grouped.keys(), reverse=True)
+        ]
+
+        orders_by_employee_per_date = [
+            {"date": d, "employees": sorted(orders_grouped[d].values(), key=lambda x: -x["number_of_orders"])}
+            for d in sorted(orders_grouped.keys(), reverse=True)
+        ]
+
+        return {
+            "bills_by_employee": bills_by_employee,
+            "orders_by_employee": orders_by_employee,
+            "bills_by_employee_per_date": bills_by_employee_per_date,
+            "orders_by_employee_per_date": orders_by_employee_per_date,
+        }
+
+    def __compute_employee_performance_segments(self, days):
+        """Bills and billed orders per employee for each of ``days``, keyed by bill date."""
+        wanted = set(days)
+        bills_rows = (
+            Bill.objects.filter(**window_filter('created_at', min(days), max(days)))
+            .annotate(day=business_day_of('created_at'))
+            .values('day', 'created_by__id', 'created_by__fullname')
+            .annotate(number_of_bills=Count('id'))
+        )
+        orders_rows = (
+            Order.objects.filter(**window_filter('bills__created_at', min(days), max(days)))
+            .annotate(day=business_day_of('bills__created_at'), order_date=business_day_of('created_at'))
+            .values('day', 'order_date', 'bills__created_by__id', 'employee__id', 'employee__fullname')
+            .annotate(number_of_orders=Count('id'))
+        )
+
+        segments = {day: {"bills": [], "orders": []} for day in days}
+        for r in bills_rows:
+            if r['day'] in wanted:
+                segments[r['day']]["bills"].append({
                     "employee_id": r['created_by__id'],
                     "employee_name": r['created_by__fullname'],
                     "number_of_bills": r['number_of_bills'],
                 })
-
-            orders_grouped = defaultdict(list)
-            for r in orders_per_date_qs:
-                orders_grouped[r['date']].append({
+        for r in orders_rows:
+            if r['day'] in wanted:
+                segments[r['day']]["orders"].append({
+                    "order_date": r['order_date'],
+                    "bill_created_by": r['bills__created_by__id'],
                     "employee_id": r['employee__id'],
                     "employee_name": r['employee__fullname'],
                     "number_of_orders": r['number_of_orders'],
                 })
-
-            bills_by_employee_per_date = [
-                {"date": d, "employees": bills_grouped[d]} for d in sorted(bills_grouped.keys(), reverse=True)
-            ]
-
-            orders_by_employee_per_date = [
-                {"date": d, "employees": orders_grouped[d]} for d in sorted(orders_grouped.keys(), reverse=True)
-            ]
-
-            data = {
-                "bills_by_employee": bills_by_employee,
-                "orders_by_employee": orders_by_employee,
-                "bills_by_employee_per_date": bills_by_employee_per_date,
-                "orders_by_employee_per_date": orders_by_employee_per_date,
-            }
-            return RestResponse(status=status.HTTP_200_OK, data=data).response
-
-        except Exception as e:
-            logging.getLogger().exception("StatisticalView.employee_performance exc=%s, req=%s", e, request.query_params)
-            return RestResponse(
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                data={"error": str(e)}
-            ).response
\ No newline at end of file
+        return segments
+
+    def __is_long_range(self, start_date, end_date):
+        return (end_date - start_date).days + 1 > settings.REPORT_JOB_MIN_DAYS
+
+    def __submit_report_job(self, report, start_date, end_date, employee_id=None):
+        """Hand the report to a background job; the 202 response points at the job to poll."""
+        if report == ReportType.EMPLOYEE_PERFORMANCE:
+            employee_id = str(employee_id) if employee_id else None
+            params = {"start_date": start_date.isoformat(), "end_date": end_date.isoformat(), "employee": employee_id}
+            compute = lambda: self.__build_employee_performance(start_date, end_date, employee_id)
+        else:
+            params = {"start_date": start_date.isoformat(), "end_date": end_date.isoformat()}
+            compute = lambda: self.__build_dish_and_combo_sold(start_date, end_date)
+
+        job = submit_report_job(report, params, compute)
+        response = RestResponse(status=status.HTTP_202_ACCEPTED, data=job, message="Báo cáo đang được xử lý, vui lòng kiểm tra lại sau!").response
+        response["Location"] = reverse("statistical-job", kwargs={"job_id": job["id"]})
+        return response
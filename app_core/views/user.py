@@ -12,7 +12,8 @@ from rest_framework.decorators import action
 from app_core.middlewares.permissions import IsManager
 from app_core.helpers.response import RestResponse
 from app_core.helpers.send_html_email import send_html_template_email
-from app_core.middlewares.authentication import UserAuthentication
+from app_core.helpers import session_store
+from app_core.middlewares.authentication import UserAuthentication, invalidate_principal
 from app_core.models.user import User, UserStatus, UserRole
 from app_core.serializers.user import ChangePasswordSerializer, UpdateUserSerializer, UserSerializer, CreateUserSerializer
 from app_core.helpers.paginator import CustomPageNumberPagination
@@ -175,8 +176,13 @@ class UserView(viewsets.ViewSet):
                     message="Vui lòng kiểm tra lại dữ liệu!"
                 ).response
             
+            previous = (user.status, user.role)
             updated_user = serializer.save()
             response_serializer = UserSerializer(updated_user, exclude=['password'])
+
+            if previous != (updated_user.status, updated_user.role):
+                session_store.update_session_data(updated_user.id, response_serializer.data)
+                invalidate_principal(updated_user.id)
             
             return RestResponse(
                 data=response_serializer.data,
@@ -204,9 +210,10 @@ class UserView(viewsets.ViewSet):
         try:
             logging.getLogger().info("WebUserView.change_password user=%s", request.user.id)
             
+            user = User.objects.get(pk=request.user.id)
             serializer = ChangePasswordSerializer(
                 data=request.data,
-                context={'user': request.user}
+                context={'user': user}
             )
             
             if not serializer.is_valid():
@@ -216,8 +223,8 @@ class UserView(viewsets.ViewSet):
                     message="Vui lòng kiểm tra lại dữ liệu!"
                 ).response
             
-            request.user.set_password(serializer.validated_data['new_password'])
-            request.user.save(update_fields=['password'])
+            user.set_password(serializer.validated_data['new_password'])
+            user.save(update_fields=['password'])
             
             return RestResponse(
                 status=status.HTTP_200_OK,
@@ -0,0 +1,19 @@
+"""
+Production server: gunicorn with threaded sync workers running the WSGI app.
+
+    gunicorn app_base.wsgi:application -c gunicorn.conf.py
+
+WEB_CONCURRENCY sets the number of worker processes, WEB_THREADS the threads
+in each. The SSE stream (/apis/events/) and the /apis/async/ reads are served
+by a separate ASGI process, see gunicorn_asgi.conf.py.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = int(os.environ.get("WEB_THREADS", 8))
+timeout = 60
+keepalive = 5
+accesslog = "-"
@@ -0,0 +1,21 @@
+"""
+ASGI server for the async endpoints: gunicorn managing uvicorn workers.
+
+    gunicorn app_base.asgi:application -c gunicorn_asgi.conf.py
+
+Only the SSE stream (/apis/events/) and the /apis/async/ reads should be
+routed here; everything else goes to the sync workers of gunicorn.conf.py,
+which served the sync endpoints faster in the benchmarks. WEB_CONCURRENCY
+sets the number of worker processes (one event loop each).
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:8001")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn_worker.UvicornWorker"
+timeout = 60
+# SSE connections stay open; give them time to finish on a graceful restart
+graceful_timeout = 30
+keepalive = 5
+accesslog = "-"
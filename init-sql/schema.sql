@@ -1,4 +1,9 @@
 -- Adminer 5.4.1 MySQL 8.0.44 dump
+--
+-- The schema of app_core migration 0001_initial. After loading it, run
+-- "manage.py migrate --fake-initial": 0001 is recorded as applied and the later
+-- migrations (indexes, constraints) are applied for real. Databases created from
+-- an older copy of this file need init-sql/upgrade/0001_initial.sql first.
 
 SET NAMES utf8;
 SET time_zone = '+00:00';
@@ -89,6 +94,7 @@ CREATE TABLE `order_items` (
   `id` int NOT NULL AUTO_INCREMENT,
   `type` varchar(20) COLLATE utf8mb4_unicode_ci NOT NULL,
   `quantity` int NOT NULL,
+  `unit_price` decimal(12,2) DEFAULT NULL,
   `note` longtext COLLATE utf8mb4_unicode_ci,
   `created_at` datetime(6) NOT NULL,
   `updated_at` datetime(6) NOT NULL,
@@ -114,11 +120,14 @@ CREATE TABLE `orders` (
   `status` varchar(20) COLLATE utf8mb4_unicode_ci NOT NULL,
   `finished_at` datetime(6) DEFAULT NULL,
   `note` longtext COLLATE utf8mb4_unicode_ci,
+  `subtotal` decimal(14,2) NOT NULL DEFAULT '0.00',
+  `item_count` int NOT NULL DEFAULT '0',
   `created_at` datetime(6) NOT NULL,
   `updated_at` datetime(6) NOT NULL,
   `dining_table_id` int NOT NULL,
   `employee_id` int NOT NULL,
   PRIMARY KEY (`id`),
+  KEY `orders_status_subtotal_idx` (`status`,`subtotal`),
   KEY `orders_dining_table_id_af4278e6_fk_dining_tables_id` (`dining_table_id`),
   KEY `orders_employee_id_098e8632_fk_users_id` (`employee_id`),
   CONSTRAINT `orders_dining_table_id_af4278e6_fk_dining_tables_id` FOREIGN KEY (`dining_table_id`) REFERENCES `dining_tables` (`id`),
@@ -159,6 +168,37 @@ CREATE TABLE daily_quantities (
     dish_id INT NULL,
     combo_id INT NULL,
     quantity INT NOT NULL CHECK (quantity >= 0),
+    sold INT NOT NULL DEFAULT 0 CHECK (sold >= 0),
     created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-)
\ No newline at end of file
+);
+
+DROP TABLE IF EXISTS `daily_revenues`;
+CREATE TABLE `daily_revenues` (
+  `id` int NOT NULL AUTO_INCREMENT,
+  `date` date NOT NULL,
+  `bill_count` int NOT NULL DEFAULT '0',
+  `revenue` decimal(14,2) NOT NULL DEFAULT '0.00',
+  `updated_at` datetime(6) NOT NULL,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `date` (`date`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+
+DROP TABLE IF EXISTS `daily_item_sales`;
+CREATE TABLE `daily_item_sales` (
+  `id` int NOT NULL AUTO_INCREMENT,
+  `date` date NOT NULL,
+  `type` varchar(20) COLLATE utf8mb4_unicode_ci NOT NULL,
+  `quantity` int NOT NULL DEFAULT '0',
+  `updated_at` datetime(6) NOT NULL,
+  `dish_id` int DEFAULT NULL,
+  `combo_id` int DEFAULT NULL,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `daily_item_sales_date_dish_uniq` (`date`, `dish_id`),
+  UNIQUE KEY `daily_item_sales_date_combo_uniq` (`date`, `combo_id`),
+  KEY `daily_item_sales_dish_id_fk_dishes_id` (`dish_id`),
+  KEY `daily_item_sales_combo_id_fk_combos_id` (`combo_id`),
+  CONSTRAINT `daily_item_sales_dish_id_fk_dishes_id` FOREIGN KEY (`dish_id`) REFERENCES `dishes` (`id`),
+  CONSTRAINT `daily_item_sales_combo_id_fk_combos_id` FOREIGN KEY (`combo_id`) REFERENCES `combos` (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,54 @@
+-- Brings a database created from the schema.sql that predates app_core's migrations
+-- up to migration 0001_initial, so Django can take over from there. The MySQL entrypoint
+-- only runs the files at the top of /docker-entrypoint-initdb.d, not this one.
+--
+--   1. mysql rms < init-sql/upgrade/0001_initial.sql
+--   2. manage.py migrate --fake-initial
+--      (0001 is recorded as applied since all its tables exist; 0002 adds the hot query
+--      indexes and the daily_quantities unique keys, after removing duplicate plans)
+--   3. Fill the new columns and rollups from the existing rows:
+--      manage.py backfill_order_item_unit_price
+--      manage.py check_order_totals --repair
+--      manage.py rebuild_daily_revenue
+--      manage.py rebuild_daily_item_sales
+--      manage.py recount_daily_quantity_sold
+
+SET NAMES utf8mb4;
+
+ALTER TABLE `order_items`
+  ADD COLUMN `unit_price` decimal(12,2) DEFAULT NULL AFTER `quantity`;
+
+ALTER TABLE `orders`
+  ADD COLUMN `subtotal` decimal(14,2) NOT NULL DEFAULT '0.00' AFTER `note`,
+  ADD COLUMN `item_count` int NOT NULL DEFAULT '0' AFTER `subtotal`,
+  ADD KEY `orders_status_subtotal_idx` (`status`,`subtotal`);
+
+ALTER TABLE `daily_quantities`
+  ADD COLUMN `sold` INT NOT NULL DEFAULT 0 CHECK (sold >= 0) AFTER `quantity`;
+
+CREATE TABLE IF NOT EXISTS `daily_revenues` (
+  `id` int NOT NULL AUTO_INCREMENT,
+  `date` date NOT NULL,
+  `bill_count` int NOT NULL DEFAULT '0',
+  `revenue` decimal(14,2) NOT NULL DEFAULT '0.00',
+  `updated_at` datetime(6) NOT NULL,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `date` (`date`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS `daily_item_sales` (
+  `id` int NOT NULL AUTO_INCREMENT,
+  `date` date NOT NULL,
+  `type` varchar(20) COLLATE utf8mb4_unicode_ci NOT NULL,
+  `quantity` int NOT NULL DEFAULT '0',
+  `updated_at` datetime(6) NOT NULL,
+  `dish_id` int DEFAULT NULL,
+  `combo_id` int DEFAULT NULL,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `daily_item_sales_date_dish_uniq` (`date`, `dish_id`),
+  UNIQUE KEY `daily_item_sales_date_combo_uniq` (`date`, `combo_id`),
+  KEY `daily_item_sales_dish_id_fk_dishes_id` (`dish_id`),
+  KEY `daily_item_sales_combo_id_fk_combos_id` (`combo_id`),
+  CONSTRAINT `daily_item_sales_dish_id_fk_dishes_id` FOREIGN KEY (`dish_id`) REFERENCES `dishes` (`id`),
+  CONSTRAINT `daily_item_sales_combo_id_fk_combos_id` FOREIGN KEY (`combo_id`) REFERENCES `combos` (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;